@@ -0,0 +1,39 @@
+import os
+import sys
+import json
+import hashlib
+import py_compile
+
+from utilities import TRANSLATIONS_FILE, compile_catalog
+
+OUTPUT_FILE = "compiled_assets.py"
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def build(output_file=OUTPUT_FILE, base_dir=SOURCE_DIR):
+    # Çeviriler ve çözümlenmiş dil tabloları bir Python modülüne gömülür; PyInstaller
+    # bunu .pyc olarak paketler, böylece açılışta JSON okuma / ayrıştırma yapılmaz.
+    # (Temalar themes.py'de paletle tanımlı olduğu için derlenecek QSS yoktur.)
+    # Göreli yollar çalışma dizinine değil proje klasörüne (base_dir) göredir.
+    output_file = os.path.join(base_dir, output_file)
+    with open(os.path.join(base_dir, TRANSLATIONS_FILE), "r", encoding="utf-8") as f:
+        raw = f.read()
+    translations = json.loads(raw)
+    source_hash = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    # Dil tabloları burada çözümlenir; paketlenmiş uygulama açılışta derleme yapmaz
+    tables, missing = compile_catalog(translations)
+    for lang, keys in missing.items():
+        print(f"Warning: {len(keys)} translation key(s) missing for '{lang}': {', '.join(keys)}")
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write("# Auto-generated by build_assets.py - do not edit.\n")
+        f.write(f"SOURCE_HASH = {source_hash!r}\n")
+        f.write(f"TRANSLATIONS = {translations!r}\n")
+        f.write(f"TRANSLATION_TABLES = {tables!r}\n")
+    py_compile.compile(output_file, doraise=True)
+    print(f"Compiled assets written to {output_file} ({source_hash[:10]})")
+    return output_file
+
+
+if __name__ == "__main__":
+    build(sys.argv[1] if len(sys.argv) > 1 else OUTPUT_FILE)
@@ -0,0 +1,474 @@
+import os
+import html
+import time
+import random
+import shutil
+from PyQt6.QtWidgets import (
+    QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTextEdit, QDialog, QLineEdit, QFileDialog, QCheckBox,
+    QMessageBox, QApplication, QProgressDialog, QComboBox, QTextBrowser, QWidget
+)
+from PyQt6.QtCore import Qt, pyqtSignal
+
+import themes
+from templates import TemplateExpander, TemplateError, WildcardLibrary, has_template_syntax
+from versions import VERSIONED_FIELDS, word_diff, tag_diff
+
+TEMPLATE_PREVIEW_COUNT = 5
+TEMPLATE_CLIPBOARD_LIMIT = 10000
+TAG_DIFF_FIELDS = ("prompt", "negative_prompt")
+
+
+class CreatePromptDialog(QDialog):
+    prompt_created = pyqtSignal(dict)
+
+    def __init__(self, translator, parent=None, existing_data=None, image_cache=None):
+        super().__init__(parent);
+        self.translator = translator;
+        self.existing_data = existing_data
+        self.image_cache = image_cache
+        self.setMinimumWidth(400);
+        self.setLayout(QVBoxLayout())
+
+        self.title_label = QLabel();
+        self.title_input = QLineEdit()
+
+        self.positive_prompt_check = QCheckBox()
+        self.positive_prompt_check.clicked.connect(self.toggle_positive_prompt_input)
+
+        self.prompt_label = QLabel()
+        self.prompt_input = QTextEdit()
+        self.prompt_input.setMinimumHeight(100);
+        self.prompt_input.setObjectName("PositivePromptText")
+        themes.polish(self.prompt_input)
+
+        self.negative_prompt_check = QCheckBox()
+        self.negative_prompt_check.clicked.connect(self.toggle_negative_prompt_input)
+        self.negative_prompt_input = QTextEdit()
+        self.negative_prompt_input.setMinimumHeight(70);
+        self.negative_prompt_input.hide()
+        self.negative_prompt_input.setObjectName("NegativePromptText")
+        themes.polish(self.negative_prompt_input)
+
+        self.image_path = ""
+        self.image_label = QLabel()
+        self.image_button = QPushButton()
+        self.image_button.clicked.connect(self.select_image)
+
+        self.download_button = QPushButton()
+        self.download_button.clicked.connect(self.download_image)
+        self.download_button.hide()
+
+        self.save_button = QPushButton();
+        self.save_button.clicked.connect(self.save_and_close)
+
+        self.layout().addWidget(self.title_label);
+        self.layout().addWidget(self.title_input)
+
+        self.layout().addWidget(self.positive_prompt_check)
+        self.layout().addWidget(self.prompt_label);
+        self.layout().addWidget(self.prompt_input)
+
+        self.layout().addWidget(self.negative_prompt_check);
+        self.layout().addWidget(self.negative_prompt_input)
+
+        image_layout = QHBoxLayout()
+        image_layout.addWidget(self.image_button)
+        image_layout.addWidget(self.download_button)
+        image_layout.addStretch()
+        image_layout.addWidget(self.image_label)
+        self.layout().addLayout(image_layout)
+
+        self.layout().addWidget(self.save_button)
+
+        if self.existing_data:
+            self.populate_fields()
+        else:
+            self.positive_prompt_check.setChecked(True)
+
+        self.retranslate_ui()
+        self.toggle_positive_prompt_input()
+        self.toggle_negative_prompt_input()
+
+    def retranslate_ui(self):
+        if self.existing_data:
+            self.setWindowTitle(self.translator.get("dialog_edit_title"))
+        else:
+            self.setWindowTitle(self.translator.get("dialog_create_title"))
+        self.title_label.setText(self.translator.get("label_title"));
+        self.prompt_label.setText(self.translator.get("label_prompt"))
+        if not self.image_path: self.image_label.setText(self.translator.get("label_no_image"))
+        self.image_button.setText(self.translator.get("button_select_image"));
+        self.save_button.setText(self.translator.get("button_save"))
+        self.positive_prompt_check.setText(self.translator.get("checkbox_positive"))
+        self.negative_prompt_check.setText(self.translator.get("checkbox_negative"));
+        self.negative_prompt_input.setPlaceholderText(self.translator.get("placeholder_negative"))
+        self.download_button.setText(self.translator.get("button_download_image"))
+
+    def populate_fields(self):
+        self.title_input.setText(self.existing_data.get("title", ""));
+
+        is_positive = self.existing_data.get("is_positive", True)
+        self.positive_prompt_check.setChecked(is_positive)
+        self.prompt_input.setPlainText(self.existing_data.get("prompt", ""))
+
+        self.image_path = self.existing_data.get("image_path", "")
+        if self.image_path and self.image_exists(self.image_path):
+            self.image_label.setText(os.path.basename(self.image_path))
+            self.download_button.show()
+        else:
+            self.image_label.setText(self.translator.get("label_no_image"))
+            self.download_button.hide()
+
+        is_negative = self.existing_data.get("is_negative", False);
+        self.negative_prompt_check.setChecked(is_negative)
+        if is_negative: self.negative_prompt_input.setPlainText(
+            self.existing_data.get("negative_prompt", ""));
+
+    def image_exists(self, path):
+        if self.image_cache is not None: return self.image_cache.exists(path)
+        return os.path.exists(path)
+
+    def toggle_positive_prompt_input(self):
+        is_visible = self.positive_prompt_check.isChecked()
+        self.prompt_label.setVisible(is_visible)
+        self.prompt_input.setVisible(is_visible)
+
+    def toggle_negative_prompt_input(self):
+        self.negative_prompt_input.setVisible(self.negative_prompt_check.isChecked())
+
+    def select_image(self):
+        title = self.translator.get("file_dialog_title");
+        filter = self.translator.get("file_dialog_filter")
+        file_name, _ = QFileDialog.getOpenFileName(self, title, "", filter)
+        if file_name:
+            self.image_path = file_name
+            self.image_label.setText(os.path.basename(file_name))
+            self.download_button.show()
+
+    def download_image(self):
+        if not self.image_path or not os.path.exists(self.image_path):
+            print("Download Error: No image path or file not found.")
+            return
+        title = self.translator.get("file_dialog_save_title");
+        filter = self.translator.get("file_dialog_save_filter")
+        original_filename = os.path.basename(self.image_path)
+        save_path, _ = QFileDialog.getSaveFileName(self, title, original_filename, filter)
+        if save_path:
+            try:
+                shutil.copy(self.image_path, save_path);
+                print(f"Image saved to: {save_path}")
+            except Exception as e:
+                print(f"Error saving image: {e}")
+
+    def get_data_from_fields(self):
+        is_positive = self.positive_prompt_check.isChecked()
+        is_negative = self.negative_prompt_check.isChecked()
+
+        return {
+            "title": self.title_input.text(),
+            "is_positive": is_positive,
+            "prompt": self.prompt_input.toPlainText() if is_positive else "",
+            "image_path": self.image_path,
+            "is_negative": is_negative,
+            "negative_prompt": self.negative_prompt_input.toPlainText() if is_negative else ""
+        }
+
+    def save_and_close(self):
+        new_data = self.get_data_from_fields()
+
+        if not new_data["title"]:
+            print(self.translator.get("error_validation_failed"))
+            QMessageBox.warning(self, "Validation Error", self.translator.get("error_validation_failed"))
+            return
+
+        has_image = bool(new_data["image_path"])
+        has_positive = is_positive = self.positive_prompt_check.isChecked() and bool(new_data["prompt"])
+        has_negative = self.negative_prompt_check.isChecked() and bool(new_data["negative_prompt"])
+
+        if not (has_image or has_positive or has_negative):
+            print(self.translator.get("error_validation_failed"))
+            QMessageBox.warning(self, "Validation Error", self.translator.get("error_validation_failed"))
+            return
+
+        if not self.existing_data:
+            self.prompt_created.emit(new_data)
+        self.accept()
+
+
+class DetailsDialog(QDialog):
+    def __init__(self, translator, prompt_data, parent=None, wildcard_library=None, versions=None):
+        super().__init__(parent)
+        self.translator = translator
+        self.prompt_data = prompt_data
+        self.wildcard_library = wildcard_library
+        self.versions = versions
+        self.history_panel = None
+        self.template_text = ""
+
+        self.setLayout(QVBoxLayout())
+        self.setMinimumWidth(500)
+
+        title = self.prompt_data.get("title", "No Title")
+        prompt_text = self.prompt_data.get("prompt", "")
+        is_positive = self.prompt_data.get("is_positive", True)
+        is_negative = self.prompt_data.get("is_negative", False)
+        negative_prompt_text = self.prompt_data.get("negative_prompt", "")
+
+        self.title_label = QLabel(title)
+        self.title_label.setFont(themes.bold_font(16))
+        self.title_label.setWordWrap(True)
+        self.layout().addWidget(self.title_label)
+
+        self.copy_pos_button = QPushButton()
+        self.copy_pos_button.clicked.connect(self.copy_positive)
+
+        if is_positive and prompt_text:
+            self.prompt_text_area = QTextEdit()
+            self.prompt_text_area.setPlainText(prompt_text)
+            self.prompt_text_area.setReadOnly(True)
+            self.prompt_text_area.setObjectName("PositivePromptText")
+            themes.polish(self.prompt_text_area)
+            self.prompt_text_area.setMinimumHeight(150)
+            self.layout().addWidget(self.prompt_text_area)
+            self.layout().addWidget(self.copy_pos_button)
+            if has_template_syntax(prompt_text):
+                self.template_text = prompt_text
+                self.build_template_preview()
+        else:
+            self.copy_pos_button.hide()
+
+        self.copy_neg_button = QPushButton()
+        self.copy_neg_button.clicked.connect(self.copy_negative)
+
+        if is_negative and negative_prompt_text:
+            self.negative_prompt_text_area = QTextEdit()
+            prefix = self.translator.get("prefix_negative")
+            self.negative_prompt_text_area.setPlainText(f"{prefix}{negative_prompt_text}")
+            self.negative_prompt_text_area.setReadOnly(True)
+            self.negative_prompt_text_area.setObjectName("NegativePromptText")
+            themes.polish(self.negative_prompt_text_area)
+            self.negative_prompt_text_area.setMinimumHeight(100)
+            self.layout().addWidget(self.negative_prompt_text_area)
+            self.layout().addWidget(self.copy_neg_button)
+        else:
+            self.copy_neg_button.hide()
+
+        # Sürüm geçmişi paneli ilk açılışta kurulur (geçmiş dosyası da o zaman okunur)
+        self.history_button = QPushButton()
+        self.history_button.setCheckable(True)
+        self.history_button.toggled.connect(self.toggle_history)
+        self.layout().addWidget(self.history_button)
+        if self.versions is None: self.history_button.hide()
+
+        self.close_button = QPushButton()
+        self.close_button.clicked.connect(self.accept)
+        self.layout().addWidget(self.close_button)
+
+        self.retranslate_ui()
+
+    def retranslate_ui(self):
+        self.setWindowTitle(self.translator.get("dialog_details_title"))
+        self.close_button.setText(self.translator.get("button_close"))
+        self.copy_pos_button.setText(self.translator.get("button_copy_positive"))
+        self.copy_neg_button.setText(self.translator.get("button_copy_negative"))
+        self.history_button.setText(self.translator.get("button_history"))
+        if self.history_panel is not None: self.retranslate_history()
+        if self.template_text:
+            self.shuffle_button.setText(self.translator.get("button_shuffle_variants"))
+            self.copy_variant_button.setText(self.translator.get("button_copy_variant"))
+            self.copy_all_button.setText(self.translator.get("button_copy_all_variants"))
+            self.export_variants_button.setText(self.translator.get("button_export_variants"))
+            self.refresh_template_preview()
+
+    def build_template_preview(self):
+        self.expander = TemplateExpander(self.wildcard_library or WildcardLibrary())
+        self.preview_seed = random.randrange(1 << 30)
+        self.preview_variants = []
+
+        self.template_info_label = QLabel()
+        self.template_info_label.setWordWrap(True)
+        self.layout().addWidget(self.template_info_label)
+
+        self.template_preview_area = QTextEdit()
+        self.template_preview_area.setReadOnly(True)
+        self.template_preview_area.setObjectName("PositivePromptText")
+        themes.polish(self.template_preview_area)
+        self.template_preview_area.setMinimumHeight(120)
+        self.layout().addWidget(self.template_preview_area)
+
+        template_buttons = QHBoxLayout()
+        self.shuffle_button = QPushButton()
+        self.shuffle_button.clicked.connect(self.shuffle_template_preview)
+        self.copy_variant_button = QPushButton()
+        self.copy_variant_button.clicked.connect(self.copy_variant)
+        self.copy_all_button = QPushButton()
+        self.copy_all_button.clicked.connect(self.copy_all_variants)
+        self.export_variants_button = QPushButton()
+        self.export_variants_button.clicked.connect(self.export_variants)
+        for button in (self.shuffle_button, self.copy_variant_button,
+                       self.copy_all_button, self.export_variants_button):
+            template_buttons.addWidget(button)
+        self.layout().addLayout(template_buttons)
+
+    def refresh_template_preview(self):
+        try:
+            total = self.expander.count(self.template_text)
+            self.preview_variants = self.expander.sample(self.template_text, TEMPLATE_PREVIEW_COUNT,
+                                                         seed=self.preview_seed)
+        except TemplateError as e:
+            self.preview_variants = []
+            self.template_info_label.setText(self.translator.get("template_error").format(error=e))
+            self.template_preview_area.clear()
+            for button in (self.copy_variant_button, self.copy_all_button, self.export_variants_button):
+                button.setEnabled(False)
+            return
+        self.template_info_label.setText(
+            self.translator.get("template_preview_label").format(count=f"{total:,}", seed=self.preview_seed))
+        self.template_preview_area.setPlainText("\n\n".join(self.preview_variants))
+
+    def shuffle_template_preview(self):
+        self.preview_seed = random.randrange(1 << 30)
+        self.refresh_template_preview()
+
+    def copy_variant(self):
+        if not self.preview_variants: return
+        QApplication.clipboard().setText(self.preview_variants[0])
+        print("Template variant copied to clipboard.")
+
+    def copy_all_variants(self):
+        # Pano tek bir metin istediği için kopyalama bir üst sınırla yapılır;
+        # sınırsız genişletme için dosyaya aktarma kullanılmalı.
+        total = self.expander.count(self.template_text)
+        variants = self.expander.iter_variants(self.template_text, limit=TEMPLATE_CLIPBOARD_LIMIT)
+        QApplication.clipboard().setText("\n".join(variants))
+        if total > TEMPLATE_CLIPBOARD_LIMIT:
+            QMessageBox.information(self, self.translator.get("dialog_details_title"),
+                                    self.translator.get("template_clipboard_limited").format(
+                                        count=TEMPLATE_CLIPBOARD_LIMIT))
+        print("Template variants copied to clipboard.")
+
+    def export_variants(self):
+        title = self.translator.get("export_variants_title")
+        filter = self.translator.get("export_variants_filter")
+        save_path, _ = QFileDialog.getSaveFileName(self, title, "variants.txt", filter)
+        if not save_path: return
+
+        total = self.expander.count(self.template_text)
+        progress_dialog = QProgressDialog(self.translator.get("export_variants_progress"),
+                                          self.translator.get("button_cancel"), 0, 0, self)
+        # QProgressDialog int32 ile sınırlı; daha büyük genişletmelerde belirsiz mod kullanılır
+        if total < 2 ** 31: progress_dialog.setMaximum(total)
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(300)
+
+        def on_progress(written):
+            if total < 2 ** 31: progress_dialog.setValue(written)
+            QApplication.processEvents()
+            return not progress_dialog.wasCanceled()
+
+        try:
+            with open(save_path, "w", encoding="utf-8") as f:
+                written = self.expander.write_variants(self.template_text, f, progress=on_progress)
+            progress_dialog.close()
+            QMessageBox.information(self, title,
+                                    self.translator.get("export_variants_done").format(count=f"{written:,}"))
+            print(f"{written} variants written to {save_path}")
+        except Exception as e:
+            progress_dialog.close()
+            print(f"Error exporting variants: {e}")
+            QMessageBox.critical(self, "Error", f"Could not write variants file: {e}")
+
+    def toggle_history(self, checked):
+        if checked and self.history_panel is None: self.build_history_panel()
+        if self.history_panel is not None: self.history_panel.setVisible(checked)
+
+    def build_history_panel(self):
+        self.history_panel = QWidget()
+        panel_layout = QVBoxLayout(self.history_panel)
+        panel_layout.setContentsMargins(0, 0, 0, 0)
+
+        selectors = QHBoxLayout()
+        self.history_from_label = QLabel()
+        self.history_from_combo = QComboBox()
+        self.history_to_label = QLabel()
+        self.history_to_combo = QComboBox()
+        self.history_mode_combo = QComboBox()
+        self.history_mode_combo.addItem("", "words")
+        self.history_mode_combo.addItem("", "tags")
+        for widget in (self.history_from_label, self.history_from_combo,
+                       self.history_to_label, self.history_to_combo):
+            selectors.addWidget(widget)
+        selectors.addStretch(1)
+        selectors.addWidget(self.history_mode_combo)
+        panel_layout.addLayout(selectors)
+
+        self.history_view = QTextBrowser()
+        self.history_view.setMinimumHeight(200)
+        panel_layout.addWidget(self.history_view)
+        self.layout().insertWidget(self.layout().indexOf(self.history_button) + 1, self.history_panel)
+
+        self.history_versions = self.versions.versions(self.prompt_data.get("id"))
+        for combo in (self.history_from_combo, self.history_to_combo):
+            for version, _ in self.history_versions:
+                combo.addItem("", version)
+        # Varsayılan: son iki sürüm
+        self.history_from_combo.setCurrentIndex(max(0, len(self.history_versions) - 2))
+        self.history_to_combo.setCurrentIndex(len(self.history_versions) - 1)
+        for combo in (self.history_from_combo, self.history_to_combo, self.history_mode_combo):
+            combo.currentIndexChanged.connect(self.render_history_diff)
+        self.retranslate_history()
+
+    def retranslate_history(self):
+        self.history_from_label.setText(self.translator.get("history_from_label"))
+        self.history_to_label.setText(self.translator.get("history_to_label"))
+        self.history_mode_combo.setItemText(0, self.translator.get("history_mode_words"))
+        self.history_mode_combo.setItemText(1, self.translator.get("history_mode_tags"))
+        item_text = self.translator.get("history_version_item")
+        for combo in (self.history_from_combo, self.history_to_combo):
+            for i, (version, timestamp) in enumerate(self.history_versions):
+                date = time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp)) if timestamp else "-"
+                combo.setItemText(i, item_text.format(version=version, date=date))
+        self.render_history_diff()
+
+    def render_history_diff(self):
+        if len(self.history_versions) < 2:
+            for combo in (self.history_from_combo, self.history_to_combo, self.history_mode_combo):
+                combo.setEnabled(False)
+            self.history_view.setPlainText(self.translator.get("history_not_enough"))
+            return
+        record_id = self.prompt_data.get("id")
+        old = self.versions.get(record_id, self.history_from_combo.currentData()) or {}
+        new = self.versions.get(record_id, self.history_to_combo.currentData()) or {}
+        by_tags = self.history_mode_combo.currentData() == "tags"
+        inserted = f"color:{themes.color('positive_text').name()}; font-weight:600;"
+        deleted = f"color:{themes.color('negative_text').name()}; text-decoration:line-through;"
+
+        sections = []
+        for field in VERSIONED_FIELDS:
+            before, after = old.get(field, ""), new.get(field, "")
+            if before == after: continue
+            if by_tags and field in TAG_DIFF_FIELDS:
+                chunks, separator = tag_diff(before, after), ", "
+            else:
+                chunks, separator = word_diff(before, after), ""
+            spans = []
+            for op, text in chunks:
+                text = html.escape(text)
+                if op == "insert": text = f'<span style="{inserted}">{text}</span>'
+                elif op == "delete": text = f'<span style="{deleted}">{text}</span>'
+                spans.append(text)
+            sections.append(f"<p><b>{html.escape(self.translator.get('history_field_' + field))}</b></p>"
+                            f"<p style=\"white-space:pre-wrap\">{separator.join(spans)}</p>")
+        if sections: self.history_view.setHtml("".join(sections))
+        else: self.history_view.setPlainText(self.translator.get("history_no_changes"))
+
+    def copy_positive(self):
+        clipboard = QApplication.clipboard()
+        clipboard.setText(self.prompt_data.get("prompt", ""))
+        print("Positive prompt copied to clipboard.")
+
+    def copy_negative(self):
+        clipboard = QApplication.clipboard()
+        clipboard.setText(self.prompt_data.get("negative_prompt", ""))
+        print("Negative prompt copied to clipboard.")
@@ -0,0 +1,272 @@
+import math
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import QObject, QTimer, QEvent
+
+from widgets import CARD_IMAGE_WIDTH
+
+PAGE_ROWS = 4             # bir sayfadaki kart satırı
+PREFETCH_VIEWPORTS = 1.5  # içeriğin sonuna bu kadar ekran kala sonraki sayfa eklenir
+RECYCLE_VIEWPORTS = 3     # görünür alanın bu kadar ekran üstünde kalan sayfalar silinir
+
+
+class CardGrid(QObject):
+    # Görünür kayıt listesinin (SortedView.visible) yalnızca kaydırma konumuna yakın
+    # kısmını kart olarak oluşturur. Kaydırma çubuğu sona yaklaştıkça yeni sayfa eklenir ve
+    # bir sonraki sayfanın resimleri arka planda hazırlanır; görünür alanın çok üstünde kalan
+    # sayfalar silinip yerlerini aynı yükseklikte bir boşluk widget'ı alır. Böylece widget
+    # sayısı ve yerleşim maliyeti toplam kayıt sayısından bağımsızdır.
+    #
+    # Layout düzeni: [spacer] + self.cards; self.cards, ids[start:start + len(cards)]'dır.
+    def __init__(self, scroll_area, layout, ids, create_card, prefetch, paged=True):
+        super().__init__(scroll_area)
+        self.scroll_area = scroll_area
+        self.layout = layout
+        self.ids = ids                  # SortedView.visible (yerinde güncellenen liste)
+        self.create_card = create_card  # record_id -> PromptCard
+        self.prefetch = prefetch        # [record_id] -> None; sonraki sayfayı arka planda hazırlar
+        self.paged = paged
+        self.cards = []
+        self.cards_by_id = {}
+        self.start = 0
+        # Silinen sayfalar için [kart_sayısı, yükseklik] yığını; toplam sayı == start
+        self.recycled = []
+        self.columns = self.compute_columns()
+        # Eklenen sayfa yerleşime yansıyana kadar yeni sayfa eklenmez
+        self.awaiting_layout = False
+        # Dil değişiminden sonra henüz çevrilmemiş (görünür alan dışındaki) kartlar var
+        self.translation_pending = False
+
+        self.spacer = QWidget()
+        self.spacer.hide()
+        self.layout.insertWidget(0, self.spacer)
+
+        # Kaydırma / boyut olayları tek bir kontrolde birleştirilir
+        self.check_timer = QTimer(self)
+        self.check_timer.setSingleShot(True)
+        self.check_timer.setInterval(0)
+        self.check_timer.timeout.connect(self.check_scroll)
+        bar = self.scroll_area.verticalScrollBar()
+        bar.valueChanged.connect(self.schedule_check)
+        bar.rangeChanged.connect(self.schedule_check)
+        self.scroll_area.viewport().installEventFilter(self)
+        self.scroll_area.widget().installEventFilter(self)
+
+    # --- Boyutlar ---
+
+    def compute_columns(self):
+        left, _, right, _ = self.layout.getContentsMargins()
+        available = self.scroll_area.viewport().width() - left - right
+        spacing = self.layout._h_spacing
+        return max(1, (available + spacing) // (CARD_IMAGE_WIDTH + spacing))
+
+    def page_size(self):
+        if not self.paged: return max(1, len(self.ids))
+        return self.columns * PAGE_ROWS
+
+    def end(self):
+        return self.start + len(self.cards)
+
+    def eventFilter(self, obj, event):
+        if event.type() != QEvent.Type.Resize: return False
+        if obj is self.scroll_area.widget():
+            self.awaiting_layout = False
+            self.schedule_check()
+        else:
+            columns = self.compute_columns()
+            if columns != self.columns: self.on_columns_changed(columns)
+            self.update_spacer()
+            self.schedule_check()
+        return False
+
+    def on_columns_changed(self, columns):
+        # Silinmiş sayfaların yüksekliği yeni sütun sayısına göre tahmin edilir
+        for entry in self.recycled:
+            count, height = entry
+            old_rows, new_rows = math.ceil(count / self.columns), math.ceil(count / columns)
+            if old_rows: entry[1] = height * new_rows // old_rows
+        self.columns = columns
+
+    def update_spacer(self):
+        height = sum(height for _, height in self.recycled) - self.layout._v_spacing
+        if self.start == 0 or height <= 0:
+            self.spacer.hide()
+            return
+        left, _, right, _ = self.layout.getContentsMargins()
+        # Tam satır genişliği: sonraki kart her zaman yeni satırdan başlar
+        self.spacer.setFixedSize(max(1, self.scroll_area.viewport().width() - left - right), height)
+        self.spacer.show()
+
+    # --- Kartların oluşturulması / silinmesi ---
+
+    def materialize(self, record_id):
+        card = self.cards_by_id.get(record_id)
+        if card is None:
+            card = self.cards_by_id[record_id] = self.create_card(record_id)
+        return card
+
+    def release(self, card):
+        self.cards_by_id.pop(card.prompt_data.get("id"), None)
+        self.layout.removeWidget(card)
+        card.deleteLater()
+
+    def reset(self):
+        # Filtre / sıralama / yükleme sonrası: pencere başa alınır. Yeni pencerede de
+        # bulunan kartlar yeniden oluşturulmaz, yalnızca yerleri değişir.
+        old_cards = dict(self.cards_by_id)
+        self.cards_by_id.clear()
+        self.start = 0
+        self.recycled = []
+        self.cards = []
+        for record_id in self.ids[:self.page_size() * 2]:
+            card = old_cards.pop(record_id, None)
+            if card is None:
+                card = self.create_card(record_id)
+                self.layout.addWidget(card)
+            self.cards_by_id[record_id] = card
+            self.cards.append(card)
+        for card in old_cards.values():
+            self.release(card)
+        self.layout.reorder([self.spacer] + self.cards)
+        self.update_spacer()
+        self.scroll_area.verticalScrollBar().setValue(0)
+        self.prefetch(self.ids[self.end():self.end() + self.page_size()])
+        self.schedule_check()
+
+    def inserted(self, index, card=None):
+        # ids'e index konumunda yeni bir kimlik eklendikten sonra çağrılır
+        end = self.end()
+        if index < self.start:
+            # Silinmiş bölgeye taşınan kart bırakılır; geri gelindiğinde yeniden oluşturulur
+            self._resize_recycled(index, 1)
+            if card is not None: self.release(card)
+        elif index < end or (index == end and end == len(self.ids) - 1):
+            if card is None: card = self.materialize(self.ids[index])
+            self.cards.insert(index - self.start, card)
+            self.layout.insertWidget(index - self.start + 1, card)
+        elif card is not None:
+            self.release(card)
+        self.schedule_check()
+
+    def take(self, index):
+        # ids'ten index konumundaki kimlik çıkarıldıktan sonra çağrılır; kart silinmez
+        if index < self.start:
+            self._resize_recycled(index, -1)
+            return None
+        offset = index - self.start
+        if offset >= len(self.cards): return None
+        card = self.cards.pop(offset)
+        self.layout.removeWidget(card)
+        return card
+
+    def removed(self, index):
+        card = self.take(index)
+        if card is not None: self.release(card)
+        self.schedule_check()
+
+    def moved(self, old_index, new_index):
+        # SortedView.update() sonucu; None görünür listede olmadığı anlamına gelir
+        if old_index == new_index: return
+        card = self.take(old_index) if old_index is not None else None
+        if new_index is not None: self.inserted(new_index, card)
+        elif card is not None: self.release(card)
+
+    def _resize_recycled(self, index, delta):
+        # Silinmiş bölgeye eklenen / çıkarılan kayıt: yalnızca sayaçlar güncellenir
+        self.start += delta
+        position = 0
+        for i, entry in enumerate(self.recycled):
+            position += entry[0]
+            if index < position or (delta > 0 and index == position) or i == len(self.recycled) - 1:
+                entry[0] += delta
+                if entry[0] <= 0:
+                    del self.recycled[i]
+                    self.update_spacer()
+                return
+
+    # --- Kaydırma ---
+
+    def schedule_check(self):
+        if not self.check_timer.isActive(): self.check_timer.start()
+
+    def check_scroll(self):
+        if self.translation_pending: self.sync_visible_cards()
+        if self.awaiting_layout: return
+        bar = self.scroll_area.verticalScrollBar()
+        viewport = self.scroll_area.viewport().height()
+        value = bar.value()
+        if self.end() < len(self.ids) and bar.maximum() - value < viewport * PREFETCH_VIEWPORTS:
+            self.append_page()
+        elif self.paged and self.start > 0 and value < self.spacer_bottom() + viewport:
+            # Home / kaydırma çubuğunu başa sürükleme gibi atlamalarda değer bir daha
+            # değişmez; görünür alan dolana kadar sayfalar art arda geri getirilir
+            self.restore_page()
+            self.schedule_check()
+        elif self.paged and len(self.cards) > self.page_size() * 3:
+            self.layout.activate()
+            page = self.page_size()
+            top = self.cards[0].geometry().top()
+            next_top = self.cards[page].geometry().top()
+            if next_top < value - viewport * RECYCLE_VIEWPORTS:
+                self.recycle_page(next_top - top)
+                self.schedule_check()
+            elif self.cards[-page].geometry().top() > value + viewport * (RECYCLE_VIEWPORTS + 1):
+                # Yukarı kaydırılırken aşağıda biriken sayfalar da bırakılır; sona
+                # yeniden yaklaşıldığında append_page ile tekrar oluşturulur
+                self.trim_page()
+
+    def retranslate(self):
+        # Dil değişimi: yalnızca görünür alandaki kartlar hemen çevrilir; diğerleri
+        # kaydırılıp görünür olduklarında, yeni oluşturulanlar zaten güncel dilde gelir
+        self.translation_pending = True
+        self.sync_visible_cards()
+
+    def sync_visible_cards(self):
+        top = self.scroll_area.verticalScrollBar().value()
+        bottom = top + self.scroll_area.viewport().height()
+        pending = False
+        for card in self.cards:
+            geometry = card.geometry()
+            if geometry.bottom() >= top and geometry.top() <= bottom: card.sync_language()
+            elif card.language_stale(): pending = True
+        self.translation_pending = pending
+
+    def spacer_bottom(self):
+        return self.spacer.geometry().bottom() if self.spacer.isVisible() else 0
+
+    def append_page(self):
+        end = self.end()
+        page = self.ids[end:end + self.page_size()]
+        for record_id in page:
+            card = self.materialize(record_id)
+            self.cards.append(card)
+            self.layout.addWidget(card)
+        self.awaiting_layout = bool(page)
+        # Sonraki sayfanın resim durumları / küçük resimleri arka planda hazırlanır
+        end += len(page)
+        self.prefetch(self.ids[end:end + self.page_size()])
+
+    def recycle_page(self, height):
+        count = self.page_size()
+        for card in self.cards[:count]:
+            self.release(card)
+        del self.cards[:count]
+        self.start += count
+        self.recycled.append([count, height])
+        self.update_spacer()
+
+    def trim_page(self):
+        count = self.page_size()
+        for card in self.cards[-count:]:
+            self.release(card)
+        del self.cards[-count:]
+
+    def restore_page(self):
+        count = self.recycled.pop()[0] if self.recycled else self.start
+        count = min(count, self.start)
+        self.start -= count
+        for offset, record_id in enumerate(self.ids[self.start:self.start + count]):
+            card = self.materialize(record_id)
+            self.cards.insert(offset, card)
+            self.layout.insertWidget(offset + 1, card)
+        self.update_spacer()
+        if self.start > 0: self.prefetch(self.ids[max(0, self.start - self.page_size()):self.start])
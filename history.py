@@ -0,0 +1,218 @@
+import os
+import json
+import uuid
+
+from storage import FileLock, StoreChanges
+
+MAX_HISTORY_STEPS = 500
+MAX_HISTORY_BYTES = 4 * 1024 * 1024
+COMPACT_LOG_BYTES = 1024 * 1024
+
+# Komut biçimleri (JSON'a olduğu gibi yazılır):
+#   {"type": "create", "records": [...], "positions": [...]}   geri alınınca silinir
+#   {"type": "delete", "records": [...], "positions": [...]}   geri alınınca yeniden eklenir
+#   {"type": "edit", "edits": [{"id": ..., "fields": {alan: [eski, yeni]}}]}
+# Düzenlemelerde yalnızca değişen alanlar saklanır, bankanın kopyası tutulmaz.
+# None değeri "alan yok" anlamına gelir.
+
+
+def field_delta(old, new):
+    delta = {}
+    for key in set(old) | set(new):
+        if key == "id": continue
+        before, after = old.get(key), new.get(key)
+        if before != after: delta[key] = [before, after]
+    return delta
+
+
+def create_command(label, records, positions):
+    return {"type": "create", "label": label, "records": [dict(r) for r in records], "positions": list(positions)}
+
+
+def delete_command(label, records, positions):
+    return {"type": "delete", "label": label, "records": [dict(r) for r in records], "positions": list(positions)}
+
+
+def edit_command(label, edits):
+    # edits: [(record_id, field_delta), ...]; boş delta'lar atlanır
+    edits = [{"id": rid, "fields": fields} for rid, fields in edits if fields]
+    if not edits: return None
+    return {"type": "edit", "label": label, "edits": edits}
+
+
+def apply_command(records, command, undo=False):
+    # Komutu kayıt listesine uygular ve etkilenen kayıtları StoreChanges olarak döndürür
+    changes = StoreChanges()
+    kind = command["type"]
+    if kind in ("create", "delete"):
+        # create'in geri alınması silme, delete'in geri alınması eklemedir
+        if (kind == "create") != undo:
+            _insert(records, command["records"], command["positions"], changes)
+        else:
+            _remove(records, [r["id"] for r in command["records"]], changes)
+    elif kind == "edit":
+        by_id = {rec.get("id"): rec for rec in records}
+        for edit in command["edits"]:
+            rec = by_id.get(edit["id"])
+            if rec is None: continue
+            for key, (before, after) in edit["fields"].items():
+                value = before if undo else after
+                if value is None: rec.pop(key, None)
+                else: rec[key] = value
+            changes.updated.append(rec)
+    return changes
+
+
+def _insert(records, new_records, positions, changes):
+    existing = {rec.get("id") for rec in records}
+    pairs = sorted(zip(positions, new_records), key=lambda pair: pair[0])
+    for position, rec in pairs:
+        if rec["id"] in existing: continue
+        rec = dict(rec)
+        records.insert(min(position, len(records)), rec)
+        changes.added.append(rec)
+
+
+def _remove(records, ids, changes):
+    ids = set(ids)
+    kept = []
+    for rec in records:
+        if rec.get("id") in ids: changes.removed.append(rec)
+        else: kept.append(rec)
+    records[:] = kept
+
+
+class UndoHistory:
+    # Geri al / yinele yığını. Her işlem "undo_history.jsonl" dosyasına tek satırlık
+    # sıkıştırılmış bir delta olarak eklenir; böylece geçmiş yeniden başlatmada korunur.
+    # Birden çok pencere aynı günlüğe kilit altında yazar: her komut pencereye özgü bir
+    # kimlik ("örnek:sıra") alır ve undo / redo satırları komutu bu kimlikle anar, böylece
+    # bir pencerenin geri alması yeniden oynatmada diğerinin komutunu almaz.
+    def __init__(self, filename, max_steps=MAX_HISTORY_STEPS, max_bytes=MAX_HISTORY_BYTES):
+        self.filename = filename
+        self.lock = FileLock(filename)
+        self.max_steps = max_steps
+        self.max_bytes = max_bytes
+        self.instance = uuid.uuid4().hex[:8]
+        self._next_id = 0
+        # Girdiler: (kimlik, komut, boyut)
+        self.undo_stack = []
+        self.redo_stack = []
+        self._bytes = 0
+        # Son sıkıştırmadan sonraki günlük boyutu; yeniden sıkıştırma bunun iki katında yapılır
+        self._compacted_size = 0
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def push(self, command):
+        if command is None: return
+        entry = (f"{self.instance}:{self._next_id}", command, len(_encode(command)))
+        self._next_id += 1
+        dropped = [cid for cid, _, _ in self.redo_stack]
+        self.undo_stack.append(entry)
+        self._bytes += entry[2]
+        self._drop_redo()
+        self._trim()
+        line = {"op": "push", "id": entry[0], "cmd": command}
+        if dropped: line["drop"] = dropped
+        self._append_log(line)
+
+    def undo(self):
+        if not self.undo_stack: return None
+        entry = self.undo_stack.pop()
+        self.redo_stack.append(entry)
+        self._append_log({"op": "undo", "id": entry[0]})
+        return entry[1]
+
+    def redo(self):
+        if not self.redo_stack: return None
+        entry = self.redo_stack.pop()
+        self.undo_stack.append(entry)
+        self._append_log({"op": "redo", "id": entry[0]})
+        return entry[1]
+
+    def load(self):
+        self.undo_stack, self.redo_stack, self._bytes = [], [], 0
+        if not os.path.exists(self.filename): return
+        try:
+            with self.lock:
+                self.undo_stack, self.redo_stack = self._read_log()
+        except Exception as e:
+            print(f"Error loading undo history: {e}")
+        self._bytes = sum(size for _, _, size in self.undo_stack + self.redo_stack)
+        self._trim()
+        self._compacted_size = 0
+
+    def _read_log(self):
+        # Tüm pencerelerin satırları sırayla oynatılır; dict'ler ekleme sırasını korur,
+        # bu yüzden son eklenen kimlik yığının tepesidir. Okunamayan satırlar atlanır.
+        undo, redo = {}, {}
+        with open(self.filename, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip(): continue
+                try:
+                    entry = json.loads(line)
+                    op = entry["op"]
+                    if op == "push":
+                        undo[entry["id"]] = entry["cmd"]
+                        for cid in entry.get("drop", ()): redo.pop(cid, None)
+                    elif op == "undo" and entry["id"] in undo:
+                        redo[entry["id"]] = undo.pop(entry["id"])
+                    elif op == "redo" and entry["id"] in redo:
+                        undo[entry["id"]] = redo.pop(entry["id"])
+                    elif op == "state":
+                        undo = {item["id"]: item["cmd"] for item in entry["undo"]}
+                        redo = {item["id"]: item["cmd"] for item in entry["redo"]}
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return ([(cid, c, len(_encode(c))) for cid, c in undo.items()],
+                [(cid, c, len(_encode(c))) for cid, c in redo.items()])
+
+    def _drop_redo(self):
+        self._bytes -= sum(size for _, _, size in self.redo_stack)
+        self.redo_stack = []
+
+    def _trim(self):
+        # Bellek sınırı: en eski adımlar atılır
+        self._bytes = _trim_entries(self.undo_stack, self._bytes, self.max_steps, self.max_bytes)
+
+    def _append_log(self, entry):
+        try:
+            with self.lock:
+                with open(self.filename, "a", encoding="utf-8") as f:
+                    f.write(_encode(entry) + "\n")
+                # Canlı durum 1 MB'ı aşsa bile her işlemde tüm dosya yeniden yazılmasın diye
+                # eşik, son sıkıştırılmış boyutun iki katıdır
+                if os.path.getsize(self.filename) > max(COMPACT_LOG_BYTES, 2 * self._compacted_size):
+                    self._compact()
+        except Exception as e:
+            print(f"Error saving undo history: {e}")
+
+    def _compact(self):
+        # Kilit altında çağrılır. Günlük dosyadan yeniden oynatılır ki diğer pencerelerin
+        # geçmişi de korunsun; sınırlara göre kırpılıp tek bir durum satırına indirgenir.
+        undo, redo = self._read_log()
+        _trim_entries(undo, sum(size for _, _, size in undo + redo), self.max_steps, self.max_bytes)
+        state = {"op": "state",
+                 "undo": [{"id": cid, "cmd": c} for cid, c, _ in undo],
+                 "redo": [{"id": cid, "cmd": c} for cid, c, _ in redo]}
+        tmp_path = self.filename + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(_encode(state) + "\n")
+        os.replace(tmp_path, self.filename)
+        self._compacted_size = os.path.getsize(self.filename)
+
+
+def _trim_entries(undo_stack, total, max_steps, max_bytes):
+    # En eski geri alma adımlarını sınırlar sağlanana dek atar; kalan toplam boyutu döndürür
+    while undo_stack and (len(undo_stack) > max_steps or total > max_bytes):
+        total -= undo_stack.pop(0)[2]
+    return total
+
+
+def _encode(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+import themes
+from theme_benchmark import build_grid
+from utilities import SettingsManager, Translator
+
+# Hedef: 20000 kartlık bir bankada dil değişimi (yeniden çizim dahil) bu süreyi aşmamalı
+LANGUAGE_SWITCH_BUDGET_MS = 50
+DEFAULT_CARD_COUNT = 20000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark a PROMPT-DB language switch.")
+    parser.add_argument("--cards", type=int, default=DEFAULT_CARD_COUNT)
+    parser.add_argument("--switches", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=LANGUAGE_SWITCH_BUDGET_MS, metavar="MS")
+    args = parser.parse_args(argv)
+
+    app = QApplication(sys.argv[:1])
+    # Kullanıcının settings.json dosyasına dokunulmaz
+    settings_file = os.path.join(tempfile.mkdtemp(prefix="promptdb-bench-"), "settings.json")
+    translator = Translator(SettingsManager(settings_file))
+    themes.install(app, False)
+    scroll_area, grid = build_grid(args.cards, translator)
+    for _ in range(10):
+        app.processEvents()
+
+    samples = []
+    languages = sorted(translator.tables)
+    for i in range(args.switches):
+        started = time.perf_counter()
+        translator.set_language(languages[i % len(languages)])
+        grid.retranslate()
+        app.processEvents()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    median = statistics.median(samples)
+    print(f"{args.cards} cards ({len(grid.cards)} materialized), {args.switches} switches: "
+          f"median {median:.1f} ms, max {max(samples):.1f} ms (target {args.budget:.0f} ms)")
+    scroll_area.close()
+    return 0 if median <= args.budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
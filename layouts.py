@@ -1,4 +1,4 @@
-from PyQt6.QtWidgets import QLayout, QSizePolicy
+from PyQt6.QtWidgets import QLayout, QSizePolicy, QWidgetItem
 from PyQt6.QtCore import Qt, QPoint, QRect, QSize
 
 class QFlowLayout(QLayout):
@@ -18,6 +18,18 @@ class QFlowLayout(QLayout):
     def addItem(self, item):
         self.item_list.append(item)
 
+    def insertWidget(self, index, widget):
+        self.addChildWidget(widget)
+        self.item_list.insert(max(0, min(index, len(self.item_list))), QWidgetItem(widget))
+        self.invalidate()
+
+    def reorder(self, widgets):
+        # Widget'ları yeniden oluşturmadan yalnızca öğe sırasını değiştirir
+        items = {id(item.widget()): item for item in self.item_list}
+        ordered = [items.pop(id(w)) for w in widgets if id(w) in items]
+        self.item_list = ordered + list(items.values())
+        self.invalidate()
+
     def count(self):
         return len(self.item_list)
 
@@ -60,6 +72,7 @@ class QFlowLayout(QLayout):
         y = rect.y()
         line_height = 0
         for item in self.item_list:
+            if item.isEmpty(): continue  # gizli widget'lar yer kaplamaz
             wid = item.widget()
             space_x = self._h_spacing
             if space_x == -1:
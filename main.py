@@ -1,23 +1,77 @@
+import time
+MODULE_STARTED = time.perf_counter()
+
 import sys
 import json
 import os
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QScrollArea, QComboBox, QLineEdit, QMessageBox,
-    QFileDialog
+    QFileDialog, QInputDialog, QFrame
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, QObject, QEvent, pyqtSignal
+from PyQt6.QtGui import QShortcut, QKeySequence
 
 from layouts import QFlowLayout
 from utilities import (
-    SettingsManager, Translator,
-    LIGHT_THEME_QSS, DARK_THEME_QSS,
-    DATA_FILE, SETTINGS_FILE
+    SettingsManager, Translator, ImageStatusCache, IMAGE_STATUS_TTL,
+    DATA_FILE, SETTINGS_FILE, HISTORY_FILE, VERSIONS_FILE
 )
 from widgets import (
-    ThemeToggleButton, CreatePromptDialog, DetailsDialog, PromptCard
+    ThemeToggleButton, PromptCard, ThumbnailCache
+)
+from grid import CardGrid
+from templates import WildcardLibrary
+import themes
+from sorting import SortedView, SORT_MODES
+from versions import VersionStore
+from history import (
+    UndoHistory, apply_command, create_command, delete_command, edit_command, field_delta
+)
+from storage import (
+    PromptStore, new_record_id, normalize_record, assign_record_ids, relink_image_paths
 )
 
+IMPORTS_DONE = time.perf_counter()
+
+EXTERNAL_CHANGE_POLL_MS = 1500
+STARTUP_TIMINGS_ENV = "PROMPTDB_STARTUP_TIMINGS"
+
+
+class ImageStatusNotifier(QObject):
+    # Worker thread'lerden gelen sonuçları GUI thread'e taşır (queued connection)
+    statuses_ready = pyqtSignal(dict)
+
+
+class StartupProbe(QObject):
+    # startup_timing.py için: ilk paint olayında açılış sürelerini JSON olarak verilen dosyaya
+    # yazar ve çıkar. Pencereli (console=False) pakette stdout olmadığı için dosya kullanılır.
+    def __init__(self, window, window_started, output_path):
+        super().__init__(window)
+        self.window = window
+        self.output_path = output_path
+        self.window_started = window_started
+        self.window_ready = time.perf_counter()
+
+    def eventFilter(self, obj, event):
+        if obj is self.window and event.type() == QEvent.Type.Paint:
+            painted = time.perf_counter()
+            self.window.removeEventFilter(self)
+            timings = {
+                "import": IMPORTS_DONE - MODULE_STARTED,
+                "data_load": self.window.startup_timings["data_load"],
+                "window_init": self.window_ready - self.window_started,
+                "first_paint": painted - MODULE_STARTED,
+                "dialogs_loaded": "dialogs" in sys.modules,
+            }
+            try:
+                with open(self.output_path, "w", encoding="utf-8") as f:
+                    json.dump(timings, f)
+            except OSError as e:
+                print(f"Could not write startup timings: {e}")
+            QTimer.singleShot(0, self.window.close)
+        return False
+
 
 class PromptBankApp(QMainWindow):
     def __init__(self, app_instance):
@@ -26,7 +80,25 @@ class PromptBankApp(QMainWindow):
         self.settings_manager = SettingsManager(SETTINGS_FILE)
         self.translator = Translator(self.settings_manager)
         self.is_dark_theme = self.settings_manager.get("is_dark_theme", False)
-        self.prompts_list = []
+        self.store = PromptStore(DATA_FILE)
+        # prompts_list, store.records ile aynı liste nesnesidir
+        self.prompts_list = self.store.records
+        self.wildcard_library = WildcardLibrary(self.prompts_list)
+        self.history = UndoHistory(HISTORY_FILE)
+        self.history.load()
+        self.versions = VersionStore(VERSIONS_FILE)
+        self.sorted_view = self.make_sorted_view()
+        self.query_service = None
+        self.image_cache = ImageStatusCache()
+        self.thumbnails = ThumbnailCache()
+        self.image_status_notifier = ImageStatusNotifier(self)
+        self.image_status_notifier.statuses_ready.connect(self.on_image_statuses_ready)
+        self.pending_image_statuses = {}
+        # Parça parça gelen sonuçlar tek bir kart geçişinde uygulanır
+        self.image_status_flush_timer = QTimer(self)
+        self.image_status_flush_timer.setSingleShot(True)
+        self.image_status_flush_timer.setInterval(100)
+        self.image_status_flush_timer.timeout.connect(self.flush_image_statuses)
 
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -48,14 +120,54 @@ class PromptBankApp(QMainWindow):
         self.export_button.setFixedSize(130, 35)
         self.export_button.clicked.connect(self.export_backup)
 
+        self.missing_images_button = QPushButton()
+        self.missing_images_button.setFixedSize(130, 35)
+        self.missing_images_button.setCheckable(True)
+        self.missing_images_button.toggled.connect(self.filter_prompts)
+
+        self.relink_button = QPushButton()
+        self.relink_button.setFixedSize(130, 35)
+        self.relink_button.clicked.connect(self.relink_images)
+
+        self.sort_combo = QComboBox()
+        self.sort_combo.setFixedSize(150, 35)
+        for mode in SORT_MODES:
+            self.sort_combo.addItem("", mode)
+        self.sort_combo.setCurrentIndex(self.sort_combo.findData(self.sorted_view.mode))
+        self.sort_combo.currentIndexChanged.connect(self.on_sort_changed)
+
+        self.sort_order_button = QPushButton()
+        self.sort_order_button.setFixedSize(35, 35)
+        self.sort_order_button.setCheckable(True)
+        self.sort_order_button.setChecked(self.sorted_view.descending)
+        self.sort_order_button.toggled.connect(self.on_sort_changed)
+
+        self.undo_button = QPushButton()
+        self.undo_button.setFixedSize(90, 35)
+        self.undo_button.clicked.connect(self.undo)
+
+        self.redo_button = QPushButton()
+        self.redo_button.setFixedSize(90, 35)
+        self.redo_button.clicked.connect(self.redo)
+
+        QShortcut(QKeySequence.StandardKey.Undo, self, activated=self.undo)
+        QShortcut(QKeySequence.StandardKey.Redo, self, activated=self.redo)
+
         self.create_button = QPushButton()
         self.create_button.setObjectName("CreateButton")
         self.create_button.setFixedSize(130, 35)
+        themes.polish(self.create_button)
         self.create_button.clicked.connect(self.open_create_dialog)
 
         self.top_bar_layout.addStretch(1)
         self.top_bar_layout.addWidget(self.search_bar)
+        self.top_bar_layout.addWidget(self.missing_images_button)
+        self.top_bar_layout.addWidget(self.sort_combo)
+        self.top_bar_layout.addWidget(self.sort_order_button)
         self.top_bar_layout.addStretch(1)
+        self.top_bar_layout.addWidget(self.undo_button)
+        self.top_bar_layout.addWidget(self.redo_button)
+        self.top_bar_layout.addWidget(self.relink_button)
         self.top_bar_layout.addWidget(self.import_button)
         self.top_bar_layout.addWidget(self.export_button)
         self.top_bar_layout.addWidget(self.create_button)
@@ -65,6 +177,7 @@ class PromptBankApp(QMainWindow):
         # --- 2. Bölüm: Kaydırma Alanı (Orta) ---
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setFrameShape(QFrame.Shape.NoFrame)
         self.scroll_content_widget = QWidget()
         self.scroll_area.setWidget(self.scroll_content_widget)
 
@@ -73,6 +186,13 @@ class PromptBankApp(QMainWindow):
         self.scroll_content_layout._h_spacing = 15
         self.scroll_content_layout._v_spacing = 15
 
+        # Kartlar görünür listenin sayfaları hâlinde oluşturulur; cards_by_id yalnızca
+        # o an oluşturulmuş kartları içerir (grid.cards_by_id ile aynı sözlük)
+        self.grid = CardGrid(self.scroll_area, self.scroll_content_layout, self.sorted_view.visible,
+                             self.create_card, self.prefetch_records,
+                             paged=self.settings_manager.get("infinite_scroll", True))
+        self.cards_by_id = self.grid.cards_by_id
+
         self.main_layout.addWidget(self.scroll_area, 1)
 
         # --- 3. Bölüm: Durum Çubuğu (Status Bar) ---
@@ -94,9 +214,28 @@ class PromptBankApp(QMainWindow):
 
         self.main_layout.addLayout(self.status_bar_layout)
 
+        themes.install(self.parent_app, self.is_dark_theme)
         self.apply_theme()
         self.retranslate_ui()
+        if self.settings_manager.get("query_service_enabled", False):
+            self.start_query_service()
+
+        load_started = time.perf_counter()
         self.load_prompts_from_disk()
+        self.startup_timings = {"data_load": time.perf_counter() - load_started}
+        self.update_undo_buttons()
+
+        # Başka pencere / script tarafından yapılan değişiklikleri yakala
+        self.external_change_timer = QTimer(self)
+        self.external_change_timer.setInterval(EXTERNAL_CHANGE_POLL_MS)
+        self.external_change_timer.timeout.connect(self.check_external_changes)
+        self.external_change_timer.start()
+
+        # Önbellekteki resim durumları TTL dolduğunda toplu olarak yenilenir
+        self.image_status_timer = QTimer(self)
+        self.image_status_timer.setInterval(IMAGE_STATUS_TTL * 1000)
+        self.image_status_timer.timeout.connect(self.refresh_image_statuses)
+        self.image_status_timer.start()
 
         self.showMaximized()
 
@@ -108,6 +247,13 @@ class PromptBankApp(QMainWindow):
 
         self.import_button.setText(self.translator.get("button_import"))
         self.export_button.setText(self.translator.get("button_export"))
+        self.missing_images_button.setText(self.translator.get("button_missing_images"))
+        self.relink_button.setText(self.translator.get("button_relink_images"))
+        self.undo_button.setText(self.translator.get("button_undo"))
+        for i in range(self.sort_combo.count()):
+            self.sort_combo.setItemText(i, self.translator.get("sort_" + self.sort_combo.itemData(i)))
+        self.sort_order_button.setText("↓" if self.sort_order_button.isChecked() else "↑")
+        self.redo_button.setText(self.translator.get("button_redo"))
 
         current_code = self.translator.get_current_language()
         index = self.language_combo.findData(current_code)
@@ -116,12 +262,11 @@ class PromptBankApp(QMainWindow):
             self.language_combo.setCurrentIndex(index)
             self.language_combo.blockSignals(False)
 
-        for i in range(self.scroll_content_layout.count()):
-            widget = self.scroll_content_layout.itemAt(i).widget()
-            if isinstance(widget, PromptCard): widget.retranslate_ui(self.translator)
+        self.grid.retranslate()
 
     def apply_theme(self):
-        self.parent_app.setStyleSheet(DARK_THEME_QSS if self.is_dark_theme else LIGHT_THEME_QSS)
+        # Yalnızca palet değişir; stylesheet yeniden ayrıştırılmaz
+        themes.apply_theme(self.parent_app, self.is_dark_theme)
         self.theme_toggle_button.set_state(self.is_dark_theme)
 
     def toggle_theme(self):
@@ -180,17 +325,28 @@ class PromptBankApp(QMainWindow):
                 current_titles = {prompt.get('title') for prompt in self.prompts_list}
                 new_prompts_added = 0
 
+                current_ids = {prompt.get('id') for prompt in self.prompts_list}
+                new_prompts = []
+
                 for prompt_data in imported_data:
                     title = prompt_data.get('title')
                     if title and title not in current_titles:
-                        self.prompts_list.append(prompt_data)
+                        normalize_record(prompt_data)
+                        if prompt_data.get('id') in current_ids: prompt_data['id'] = new_record_id()
+                        new_prompts.append(prompt_data)
                         current_titles.add(title)
                         new_prompts_added += 1
 
-                # Sadece yeni prompt eklendiyse kaydet ve yeniden yükle
+                # Sadece yeni prompt eklendiyse kaydet; yalnızca yeni kartlar eklenir
                 if new_prompts_added > 0:
+                    assign_record_ids(new_prompts)
+                    start = len(self.prompts_list)
+                    self.prompts_list.extend(new_prompts)
+                    self.record_command(create_command("import", new_prompts,
+                                                       range(start, start + len(new_prompts))))
+                    for prompt_data in new_prompts:
+                        self.create_and_add_card(prompt_data)
                     self.save_prompts_to_disk()
-                    self.reload_all_prompts()
 
                     QMessageBox.information(self,
                                             self.translator.get("import_success_title"),
@@ -207,63 +363,156 @@ class PromptBankApp(QMainWindow):
                                      self.translator.get("import_error_text"))
 
     def reload_all_prompts(self):
-        while self.scroll_content_layout.count():
-            child = self.scroll_content_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
         self.load_prompts_from_disk()
 
+    def make_filter(self):
+        search_text = self.search_bar.text().casefold()
+        only_missing = self.missing_images_button.isChecked()
+        if not search_text and not only_missing: return None
+        features = self.sorted_view.cache.features
+
+        def matches(prompt_data):
+            if search_text not in features(prompt_data)["title"]: return False
+            return not only_missing or self.record_image_missing(prompt_data)
+        return matches
+
     def filter_prompts(self):
-        search_text = self.search_bar.text().lower()
-        for i in range(self.scroll_content_layout.count()):
-            widget = self.scroll_content_layout.itemAt(i).widget()
-            if isinstance(widget, PromptCard):
-                title = widget.prompt_data.get("title", "").lower()
-
-                if search_text in title:
-                    widget.setVisible(True)
-                else:
-                    widget.setVisible(False)
+        # Kartlar gizlenmez: filtre kayıtlar üzerinde çalışır ve grid yalnızca
+        # eşleşenlerin ilk sayfalarını oluşturur
+        self.sorted_view.set_filter(self.make_filter())
+        self.grid.reset()
 
     def open_create_dialog(self):
-        dialog = CreatePromptDialog(self.translator, self)
+        from dialogs import CreatePromptDialog
+        dialog = CreatePromptDialog(self.translator, self, image_cache=self.image_cache)
         dialog.prompt_created.connect(self.on_prompt_created)
         dialog.exec()
 
     def on_prompt_created(self, prompt_data):
+        prompt_data["id"] = new_record_id()
+        prompt_data["created_at"] = prompt_data["modified_at"] = int(time.time())
         self.prompts_list.append(prompt_data)
+        self.record_command(create_command("create", [prompt_data], [len(self.prompts_list) - 1]))
+        self.versions.record([prompt_data])
         self.create_and_add_card(prompt_data)
         self.save_prompts_to_disk()
 
-    def create_and_add_card(self, prompt_data):
-        card = PromptCard(prompt_data, self.translator)
+    def create_card(self, record_id):
+        # CardGrid tarafından, kayıt görünür sayfaya girdiğinde çağrılır
+        card = PromptCard(self.sorted_view.record(record_id), self.translator, self.image_cache,
+                          self.wildcard_library, self.thumbnails, self.versions)
         card.edit_requested.connect(self.on_edit_requested)
         card.delete_requested.connect(self.on_delete_requested)
-        self.scroll_content_layout.addWidget(card)
+        self.ensure_image_status(card)
+        return card
+
+    def prefetch_records(self, record_ids):
+        # Sonraki sayfa: resim durumları ve küçük resimler worker thread'lerde hazırlanır
+        paths = [self.sorted_view.record(rid).get("image_path", "") for rid in record_ids]
+        self.request_image_statuses(paths)
+        self.thumbnails.prefetch([p for p in paths if self.image_cache.get(p) is not False])
+
+    def create_and_add_card(self, prompt_data, position=None):
+        # Kayıt, sıralı görünümdeki yerine ikili arama ile eklenir; kart yalnızca
+        # oluşturulmuş sayfalardan birine düşüyorsa yaratılır. position: kayıt listenin
+        # sonuna değil araya eklendiyse (undo ile geri gelen silme) prompts_list'teki yeri
+        if prompt_data["id"] in self.sorted_view: return
+        if position is not None and not self.sorted_view.place(self.prompts_list, position):
+            self.grid.reset()
+            return
+        index = self.sorted_view.insert(prompt_data)
+        if index is not None: self.grid.inserted(index)
+
+    def remove_card(self, record_id):
+        index = self.sorted_view.forget(record_id)
+        if index is not None: self.grid.removed(index)
+
+    def reposition_card(self, prompt_data, invalidate=True):
+        if prompt_data["id"] not in self.sorted_view:
+            self.create_and_add_card(prompt_data)
+            return
+        self.grid.moved(*self.sorted_view.update(prompt_data, invalidate))
+
+    def make_sorted_view(self):
+        return SortedView(self.settings_manager.get("sort_mode", "bank"),
+                          self.settings_manager.get("sort_descending", False),
+                          image_state=self.record_has_image)
+
+    def record_has_image(self, prompt_data):
+        return bool(self.image_cache.get(prompt_data.get("image_path", "")))
+
+    def record_image_missing(self, prompt_data):
+        image_path = prompt_data.get("image_path", "")
+        return bool(image_path) and self.image_cache.get(image_path) is False
+
+    def on_sort_changed(self):
+        mode = self.sort_combo.currentData()
+        if mode == "similarity":
+            titles = [p.get("title", "") for p in self.prompts_list]
+            title, ok = QInputDialog.getItem(self, self.translator.get("sort_reference_title"),
+                                             self.translator.get("sort_reference_label"), titles, 0, False)
+            if not ok:
+                self.sort_combo.blockSignals(True)
+                self.sort_combo.setCurrentIndex(self.sort_combo.findData(self.sorted_view.mode))
+                self.sort_combo.blockSignals(False)
+                return
+            self.sorted_view.set_reference(self.prompts_list[titles.index(title)])
+        self.sorted_view.mode = mode
+        self.sorted_view.descending = self.sort_order_button.isChecked()
+        self.sort_order_button.setText("↓" if self.sorted_view.descending else "↑")
+        # Tek bir tam sıralama; ilk sayfalarda kalan kartlar yeniden oluşturulmaz
+        self.sorted_view.rebuild(self.prompts_list)
+        self.grid.reset()
+        self.settings_manager.set("sort_mode", "bank" if mode == "similarity" else mode)
+        self.settings_manager.set("sort_descending", self.sorted_view.descending)
 
     def on_edit_requested(self, card_widget):
-        dialog = CreatePromptDialog(self.translator, self, existing_data=card_widget.prompt_data)
+        from dialogs import CreatePromptDialog
+        dialog = CreatePromptDialog(self.translator, self, existing_data=card_widget.prompt_data,
+                                    image_cache=self.image_cache)
         if dialog.exec():
             new_data = dialog.get_data_from_fields()
+            new_data["id"] = card_widget.prompt_data["id"]
+            if card_widget.prompt_data.get("created_at"):
+                new_data["created_at"] = card_widget.prompt_data["created_at"]
+            new_data["modified_at"] = int(time.time())
+            self.record_command(edit_command("edit", [(new_data["id"],
+                                                       field_delta(card_widget.prompt_data, new_data))]))
+            # Geçmişi olmayan eski kayıtlar için önce düzenleme öncesi hâli saklanır
+            self.versions.record([card_widget.prompt_data, new_data])
             try:
                 index = self.prompts_list.index(card_widget.prompt_data)
                 self.prompts_list[index] = new_data
             except ValueError:
                 self.prompts_list.append(new_data)
+            self.thumbnails.invalidate([new_data.get("image_path", "")])
             card_widget.update_card_ui(new_data)
+            self.ensure_image_status(card_widget)
+            self.reposition_card(new_data)
             self.save_prompts_to_disk()
 
     def on_delete_requested(self, card_widget):
         data_to_delete = card_widget.prompt_data
-        if data_to_delete in self.prompts_list: self.prompts_list.remove(data_to_delete)
-        card_widget.deleteLater()
+        if data_to_delete in self.prompts_list:
+            position = self.prompts_list.index(data_to_delete)
+            self.record_command(delete_command("delete", [data_to_delete], [position]))
+            self.prompts_list.remove(data_to_delete)
+        self.remove_card(data_to_delete.get("id"))
         self.save_prompts_to_disk()
 
+    def closeEvent(self, event):
+        self.image_cache.shutdown()
+        self.thumbnails.shutdown()
+        if self.query_service is not None: self.query_service.stop()
+        super().closeEvent(event)
+
     def save_prompts_to_disk(self):
         try:
-            with open(DATA_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.prompts_list, f, indent=4, ensure_ascii=False)
+            changes = self.store.save()
+            if changes:
+                print(f"Merged external changes while saving: {changes}")
+                self.apply_store_changes(changes)
+            self.publish_query_index()
             print("Prompts saved successfully.")
         except Exception as e:
             print(f"Error saving prompts: {e}")
@@ -271,21 +520,142 @@ class PromptBankApp(QMainWindow):
     def load_prompts_from_disk(self):
         if not os.path.exists(DATA_FILE): return
         try:
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                self.prompts_list = json.load(f)
+            self.store.load()
+            self.sorted_view.rebuild(self.prompts_list)
+            self.sorted_view.set_filter(self.make_filter())
+            self.grid.reset()
+            self.refresh_image_statuses()
+            self.publish_query_index()
+            print(f"Loaded {len(self.prompts_list)} prompts.")
+        except Exception as e:
+            print(f"Error loading prompts: {e}"); self.prompts_list.clear()
+
+    def request_image_statuses(self, paths):
+        self.image_cache.check_many(paths, self.image_status_notifier.statuses_ready.emit)
+
+    def refresh_image_statuses(self):
+        self.request_image_statuses([p.get("image_path", "") for p in self.prompts_list])
+
+    def ensure_image_status(self, card):
+        if card.image_available is None:
+            self.request_image_statuses([card.prompt_data.get("image_path", "")])
+
+    def on_image_statuses_ready(self, statuses):
+        self.pending_image_statuses.update(statuses)
+        if not self.image_status_flush_timer.isActive():
+            self.image_status_flush_timer.start()
+
+    def flush_image_statuses(self):
+        statuses, self.pending_image_statuses = self.pending_image_statuses, {}
+        for card in list(self.cards_by_id.values()):
+            image_path = card.prompt_data.get("image_path", "")
+            if image_path in statuses: card.set_image_available(statuses[image_path])
+        # Sıralama / filtre resim durumuna bağlıysa yalnızca durumu gelen kayıtlar taşınır
+        if self.sorted_view.mode == "image" or self.missing_images_button.isChecked():
             for prompt_data in self.prompts_list:
-                if "negative_prompt" not in prompt_data: prompt_data["negative_prompt"] = ""
-                if "is_negative" not in prompt_data: prompt_data["is_negative"] = bool(prompt_data["negative_prompt"])
-                if "is_positive" not in prompt_data:
-                    prompt_data["is_positive"] = True
+                if prompt_data.get("image_path", "") in statuses:
+                    self.reposition_card(prompt_data, invalidate=False)
+
+    def relink_images(self):
+        missing_dirs = {}
+        for prompt_data in self.prompts_list:
+            if self.record_image_missing(prompt_data):
+                folder = os.path.dirname(prompt_data["image_path"])
+                missing_dirs[folder] = missing_dirs.get(folder, 0) + 1
+        suggested = max(missing_dirs, key=missing_dirs.get) if missing_dirs else ""
+
+        old_prefix, ok = QInputDialog.getText(self, self.translator.get("relink_dialog_title"),
+                                              self.translator.get("relink_old_prefix_label"), text=suggested)
+        if not ok or not old_prefix.strip(): return
+        new_prefix = QFileDialog.getExistingDirectory(self, self.translator.get("relink_new_folder_title"))
+        if not new_prefix: return
+
+        old_paths = {p["id"]: p.get("image_path", "") for p in self.prompts_list}
+        changed = relink_image_paths(self.prompts_list, old_prefix.strip(), new_prefix)
+        if changed:
+            self.record_command(edit_command("relink", [
+                (p["id"], {"image_path": [old_paths[p["id"]], p["image_path"]]}) for p in changed]))
+            self.versions.record(changed, timestamp=int(time.time()))
+            self.image_cache.invalidate([p["image_path"] for p in changed])
+            for prompt_data in changed:
+                card = self.cards_by_id.get(prompt_data["id"])
+                if card is not None: card.update_card_ui(prompt_data)
+                self.reposition_card(prompt_data)
+            self.request_image_statuses([p["image_path"] for p in changed])
+            self.save_prompts_to_disk()
+        QMessageBox.information(self, self.translator.get("relink_dialog_title"),
+                                self.translator.get("relink_result_text").format(count=len(changed)))
 
-                self.create_and_add_card(prompt_data)
-            print(f"Loaded {len(self.prompts_list)} prompts.")
+    def start_query_service(self):
+        # İsteğe bağlı yerel servis; dialogs gibi yalnızca etkinse yüklenir
+        from query_service import QueryService
+        try:
+            self.query_service = QueryService(self.settings_manager.get("query_service_port", 8765))
+            self.query_service.start()
+        except OSError as e:
+            print(f"Could not start query service: {e}")
+            self.query_service = None
+
+    def publish_query_index(self):
+        if self.query_service is not None: self.query_service.publish(self.prompts_list)
+
+    def record_command(self, command):
+        self.history.push(command)
+        self.update_undo_buttons()
+
+    def update_undo_buttons(self):
+        self.undo_button.setEnabled(self.history.can_undo())
+        self.redo_button.setEnabled(self.history.can_redo())
+
+    def undo(self):
+        command = self.history.undo()
+        if command is not None: self.apply_history_command(command, undo=True)
+
+    def redo(self):
+        command = self.history.redo()
+        if command is not None: self.apply_history_command(command, undo=False)
+
+    def apply_history_command(self, command, undo):
+        # Yalnızca komutun dokunduğu kayıtlar / kartlar güncellenir
+        changes = apply_command(self.prompts_list, command, undo=undo)
+        self.versions.record(changes.updated + changes.added, timestamp=int(time.time()))
+        self.apply_store_changes(changes)
+        self.save_prompts_to_disk()
+        self.update_undo_buttons()
+        print(f"{'Undo' if undo else 'Redo'}: {command.get('label', command['type'])} {changes}")
+
+    def check_external_changes(self):
+        try:
+            changes = self.store.check_external_changes()
         except Exception as e:
-            print(f"Error loading prompts: {e}"); self.prompts_list = []
+            print(f"Error checking external changes: {e}")
+            return
+        if changes:
+            print(f"External changes detected: {changes}")
+            self.apply_store_changes(changes)
+            self.publish_query_index()
+
+    def apply_store_changes(self, changes):
+        # Tüm grid'i yeniden kurmak yerine yalnızca etkilenen kartlar güncellenir
+        for prompt_data in changes.removed:
+            self.remove_card(prompt_data["id"])
+        for prompt_data in changes.updated:
+            card = self.cards_by_id.get(prompt_data["id"])
+            if card is not None:
+                card.update_card_ui(prompt_data)
+                self.ensure_image_status(card)
+            self.reposition_card(prompt_data)
+        if changes.added:
+            # Banka sırası için kayıtlar listedeki sıralarıyla ve konumlarıyla eklenir
+            positions = {rec["id"]: i for i, rec in enumerate(self.prompts_list)}
+            for prompt_data in sorted(changes.added, key=lambda rec: positions.get(rec["id"], 0)):
+                self.create_and_add_card(prompt_data, positions.get(prompt_data["id"]))
 
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    window_started = time.perf_counter()
     window = PromptBankApp(app_instance=app)
+    if os.environ.get(STARTUP_TIMINGS_ENV):
+        window.installEventFilter(StartupProbe(window, window_started, os.environ[STARTUP_TIMINGS_ENV]))
     sys.exit(app.exec())
\ No newline at end of file
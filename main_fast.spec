@@ -0,0 +1,71 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Hızlı açılış profili: onedir (her açılışta geçici klasöre açma yok), UPX yok
+# (sıkıştırılmış DLL'leri açmak açılışı yavaşlatır) ve kullanılmayan Qt modülleri hariç.
+#
+#   pyinstaller main_fast.spec
+#   python startup_timing.py dist/PROMPT-DB-fast/PROMPT-DB-fast(.exe)
+
+import sys
+
+# PyInstaller spec'i, klasörünü sys.path'e eklemeden çalıştırır; build_assets buradan bulunur
+sys.path.insert(0, SPECPATH)
+import build_assets
+
+build_assets.build(base_dir=SPECPATH)
+
+QT_EXCLUDES = [
+    'PyQt6.QtNetwork', 'PyQt6.QtQml', 'PyQt6.QtQuick', 'PyQt6.QtQuickWidgets',
+    'PyQt6.QtWebEngineCore', 'PyQt6.QtWebEngineWidgets', 'PyQt6.QtWebChannel',
+    'PyQt6.QtMultimedia', 'PyQt6.QtMultimediaWidgets', 'PyQt6.QtSql', 'PyQt6.QtTest',
+    'PyQt6.QtPdf', 'PyQt6.QtPdfWidgets', 'PyQt6.QtSvg', 'PyQt6.QtSvgWidgets',
+    'PyQt6.QtOpenGL', 'PyQt6.QtOpenGLWidgets', 'PyQt6.QtPrintSupport', 'PyQt6.QtDBus',
+    'PyQt6.QtBluetooth', 'PyQt6.QtNfc', 'PyQt6.QtPositioning', 'PyQt6.QtSensors',
+    'PyQt6.QtSerialPort', 'PyQt6.QtSpatialAudio', 'PyQt6.QtTextToSpeech',
+    'PyQt6.QtRemoteObjects', 'PyQt6.QtHelp', 'PyQt6.QtDesigner', 'PyQt6.QtXml',
+    'PyQt6.Qt3DCore', 'PyQt6.QtCharts', 'PyQt6.QtDataVisualization',
+]
+PY_EXCLUDES = ['tkinter', 'unittest', 'pydoc', 'doctest', 'xmlrpc', 'lib2to3', 'pytest']
+
+a = Analysis(
+    ['main.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    # Tembel yüklenen modüller statik analizde de bulunur, yine de açıkça belirtilir
+    hiddenimports=['dialogs', 'compiled_assets'],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=QT_EXCLUDES + PY_EXCLUDES,
+    noarchive=False,
+    optimize=1,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='PROMPT-DB-fast',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='PROMPT-DB-fast',
+)
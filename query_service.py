@@ -0,0 +1,355 @@
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import threading
+import http.client
+import socketserver
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, quote
+
+from utilities import prompt_tags, DATA_FILE
+
+# Yerel sorgu servisi: ComfyUI gibi araçlar prompt'ları GUI'ye dokunmadan çeker.
+#   GET  /health
+#   GET  /prompt/<id>
+#   GET  /prompts?ids=a,b,c               (toplu)
+#   GET  /search?q=metin&limit=20
+#   GET  /random?tag=x&tag=y&n=5&seed=1
+#   GET  /changes?since=<generation>&timeout=30   (long-poll değişiklik bildirimi)
+#   POST /batch   [{"path": "/prompt/a"}, {"path": "/search?q=x"}]
+# Yalnızca 127.0.0.1'e (ya da bir Unix soketine) bağlanır.
+
+DEFAULT_PORT = 8765
+CHANGE_LOG_SIZE = 1000
+MAX_POLL_SECONDS = 60
+MAX_BATCH = 256
+IDLE_CONNECTION_SECONDS = 30
+
+
+class QueryIndex:
+    # Değişmez anlık görüntü: istekler tek bir referansı okur, GUI yeni görüntüyü
+    # hazırlayıp referansı atomik olarak değiştirir; böylece okumalar hep tutarlıdır.
+    def __init__(self, records, generation=0):
+        self.generation = generation
+        self.records = tuple(records)
+        self.by_id = {rec["id"]: rec for rec in self.records}
+        self.by_tag = {}
+        self.by_word = {}
+        self.search_text = {}
+        for rec in self.records:
+            rid = rec["id"]
+            for tag in set(prompt_tags(rec.get("prompt", ""))):
+                self.by_tag.setdefault(tag, []).append(rid)
+            text = f"{rec.get('title', '')}\n{rec.get('prompt', '')}".lower()
+            self.search_text[rid] = text
+            for word in set(text.replace(",", " ").split()):
+                self.by_word.setdefault(word.strip("()[]{}:."), set()).add(rid)
+
+    def get(self, record_id):
+        return self.by_id.get(record_id)
+
+    def search(self, query, limit=20):
+        terms = query.lower().split()
+        if not terms: return list(self.records[:limit])
+        # Tam kelime eşleşmeleri ters indeksten; yoksa alt-dize taraması
+        candidates = None
+        for term in terms:
+            ids = self.by_word.get(term.strip("()[]{}:.,"))
+            if ids is None: candidates = None; break
+            candidates = ids if candidates is None else candidates & ids
+        pool = [self.by_id[rid] for rid in candidates] if candidates is not None else self.records
+        results = []
+        for rec in pool:
+            text = self.search_text[rec["id"]]
+            if all(term in text for term in terms):
+                results.append(rec)
+                if len(results) >= limit: break
+        return results
+
+    def random_by_tags(self, tags, n=1, seed=None):
+        rng = random.Random(seed)
+        ids = None
+        for tag in tags:
+            tagged = set(self.by_tag.get(tag.lower(), ()))
+            ids = tagged if ids is None else ids & tagged
+        pool = sorted(ids) if ids is not None else [rec["id"] for rec in self.records]
+        picked = rng.sample(pool, min(n, len(pool)))
+        return [self.by_id[rid] for rid in picked]
+
+    def diff(self, previous):
+        changed = [rid for rid, rec in self.by_id.items() if previous.by_id.get(rid) != rec]
+        removed = [rid for rid in previous.by_id if rid not in self.by_id]
+        return changed, removed
+
+
+class QueryService:
+    def __init__(self, port=DEFAULT_PORT, unix_socket=None):
+        self.port = port
+        self.unix_socket = unix_socket
+        self.index = QueryIndex([])
+        self._changes = []
+        self._condition = threading.Condition()
+        self._builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query-index")
+        self._server = None
+        self._thread = None
+
+    def publish(self, records):
+        # GUI thread'inden çağrılır: kayıtların kopyası alınır, indeks arka planda kurulur
+        snapshot = [dict(rec) for rec in records]
+        self._builder.submit(self._swap_index, snapshot)
+
+    def _swap_index(self, snapshot):
+        try:
+            previous = self.index
+            index = QueryIndex(snapshot, previous.generation + 1)
+            changed, removed = index.diff(previous)
+            with self._condition:
+                self.index = index
+                if changed or removed:
+                    self._changes.append({"generation": index.generation, "changed": changed, "removed": removed})
+                    del self._changes[:-CHANGE_LOG_SIZE]
+                self._condition.notify_all()
+        except Exception as e:
+            print(f"Error building query index: {e}")
+
+    def changes_since(self, generation, timeout):
+        deadline = time.monotonic() + min(timeout, MAX_POLL_SECONDS)
+        with self._condition:
+            while self.index.generation <= generation:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0: break
+                self._condition.wait(remaining)
+            entries = [c for c in self._changes if c["generation"] > generation]
+            current = self.index.generation
+            # Değişiklik günlüğü bu noktadan eskiyse istemci her şeyi yeniden yüklemeli
+            truncated = bool(self._changes) and generation < self._changes[0]["generation"] - 1
+        changed, removed = [], []
+        for entry in entries:
+            changed.extend(entry["changed"])
+            removed.extend(entry["removed"])
+        return {"generation": current, "changed": sorted(set(changed)), "removed": sorted(set(removed)),
+                "full_reload": truncated}
+
+    def start(self):
+        handler = _make_handler(self)
+        # Başlık ve gövde ayrı yazıldığı için Nagle + gecikmeli ACK ~40 ms ekler
+        handler.disable_nagle_algorithm = not self.unix_socket
+        if self.unix_socket:
+            if os.path.exists(self.unix_socket): os.remove(self.unix_socket)
+            self._server = _ThreadedUnixHTTPServer(self.unix_socket, handler)
+            where = self.unix_socket
+        else:
+            self._server = _ThreadedHTTPServer(("127.0.0.1", self.port), handler)
+            where = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, name="query-service", daemon=True)
+        self._thread.start()
+        print(f"Query service listening on {where}")
+        return where
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self._condition:
+            self._condition.notify_all()
+        self._builder.shutdown(wait=False)
+        if self.unix_socket and os.path.exists(self.unix_socket): os.remove(self.unix_socket)
+
+
+class _ThreadedHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    # Her bağlantı kendi daemon thread'inde işlenir: keep-alive bağlantılar ve 60 sn'ye
+    # kadar süren long-poll'lar diğer istemcileri bekletmez (sabit havuzda 17. istemci
+    # boşta kalan bir bağlantının kapanmasını beklerdi). Thread maliyeti keep-alive ile
+    # bağlantı başına bir kez ödenir; daemon oldukları için kapanışı da bekletmezler.
+    daemon_threads = True
+    block_on_close = False
+
+
+class _ThreadedUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    block_on_close = False
+
+
+def _make_handler(service):
+    class QueryRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        timeout = IDLE_CONNECTION_SECONDS
+        server_version = "PromptDBQuery/1.0"
+
+        def address_string(self):
+            return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            status, body = dispatch(service, self.path)
+            self._send(status, body)
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/batch":
+                self._send(404, {"error": "not found"}); return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                requests = json.loads(self.rfile.read(length) or b"[]")
+            except Exception:
+                self._send(400, {"error": "invalid JSON body"}); return
+            if not isinstance(requests, list) or len(requests) > MAX_BATCH:
+                self._send(400, {"error": f"body must be a list of at most {MAX_BATCH} requests"}); return
+            # Tüm alt istekler aynı indeks görüntüsünden yanıtlanır
+            index = service.index
+            responses = []
+            for item in requests:
+                if isinstance(item, dict) and isinstance(item.get("path"), str):
+                    status, body = dispatch(service, item["path"], index)
+                else:
+                    status, body = 400, {"error": 'each request must be an object with a "path" string'}
+                responses.append({"status": status, "body": body})
+            self._send(200, {"generation": index.generation, "responses": responses})
+
+        def _send(self, status, body):
+            payload = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return QueryRequestHandler
+
+
+def dispatch(service, path, index=None):
+    url = urlparse(path)
+    params = parse_qs(url.query)
+    index = index or service.index
+
+    def param(name, default=None):
+        return params.get(name, [default])[0]
+
+    try:
+        if url.path == "/health":
+            return 200, {"status": "ok", "generation": index.generation, "count": len(index.records)}
+        if url.path.startswith("/prompt/"):
+            rec = index.get(url.path[len("/prompt/"):])
+            return (200, rec) if rec is not None else (404, {"error": "not found"})
+        if url.path == "/prompts":
+            ids = [i for i in (param("ids") or "").split(",") if i]
+            return 200, {"generation": index.generation, "prompts": [index.get(i) for i in ids]}
+        if url.path == "/search":
+            limit = int(param("limit", 20))
+            return 200, {"generation": index.generation, "prompts": index.search(param("q", ""), limit)}
+        if url.path == "/random":
+            seed = param("seed")
+            prompts = index.random_by_tags(params.get("tag", []), int(param("n", 1)),
+                                           int(seed) if seed is not None else None)
+            return 200, {"generation": index.generation, "prompts": prompts}
+        if url.path == "/changes":
+            return 200, service.changes_since(int(param("since", 0)), float(param("timeout", 30)))
+    except ValueError as e:
+        return 400, {"error": str(e)}
+    return 404, {"error": "not found"}
+
+
+class QueryClient:
+    # Kalıcı (keep-alive) bağlantı kullanan küçük istemci
+    def __init__(self, port=DEFAULT_PORT, unix_socket=None, timeout=70):
+        self.port = port
+        self.unix_socket = unix_socket
+        self.timeout = timeout
+        self._conn = None
+
+    def _connection(self):
+        if self._conn is None:
+            if self.unix_socket:
+                self._conn = _UnixHTTPConnection(self.unix_socket, self.timeout)
+            else:
+                self._conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=self.timeout)
+        return self._conn
+
+    def request(self, path, body=None):
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                if body is None:
+                    conn.request("GET", path)
+                else:
+                    conn.request("POST", path, json.dumps(body), {"Content-Type": "application/json"})
+                response = conn.getresponse()
+                return json.loads(response.read())
+            except (ConnectionError, http.client.HTTPException):
+                # Sunucu boşta kalan bağlantıyı kapattıysa bir kez yeniden bağlan
+                self.close()
+                if attempt: raise
+
+    def get(self, record_id):
+        return self.request("/prompt/" + quote(record_id))
+
+    def search(self, query, limit=20):
+        return self.request(f"/search?q={quote(query)}&limit={limit}")["prompts"]
+
+    def random(self, tags=(), n=1, seed=None):
+        query = "&".join(f"tag={quote(t)}" for t in tags) + f"&n={n}"
+        if seed is not None: query += f"&seed={seed}"
+        return self.request("/random?" + query)["prompts"]
+
+    def batch(self, paths):
+        return self.request("/batch", [{"path": p} for p in paths])
+
+    def changes(self, since, timeout=30):
+        return self.request(f"/changes?since={since}&timeout={timeout}")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+def main(argv=None):
+    # GUI olmadan çalışan daemon: veri dosyasını izler ve servisi sunar
+    from storage import PromptStore
+
+    parser = argparse.ArgumentParser(description="Serve the prompt bank to local tools without the GUI.")
+    parser.add_argument("--data", default=DATA_FILE)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of localhost TCP")
+    parser.add_argument("--poll", type=float, default=1.0, help="seconds between data file checks")
+    args = parser.parse_args(argv)
+
+    store = PromptStore(args.data)
+    store.load()
+    service = QueryService(args.port, args.unix)
+    service.publish(store.records)
+    service.start()
+    try:
+        while True:
+            time.sleep(args.poll)
+            try:
+                if store.check_external_changes(): service.publish(store.records)
+            except Exception as e:
+                print(f"Error checking external changes: {e}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+import bisect
+
+from utilities import prompt_tags
+
+SORT_MODES = ["bank", "title", "created", "modified", "image", "length", "tags", "similarity"]
+
+
+class Descending:
+    # Azalan sıralama için karşılaştırmayı tersine çeviren sarmalayıcı (string'ler de dahil)
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+class SortKeyCache:
+    # Kayıt başına bir kez hesaplanan sıralama özellikleri. Kayıt eklendiğinde ya da
+    # değiştiğinde invalidate() ile yalnızca o kaydın girdisi yeniden hesaplanır.
+    def __init__(self):
+        self._features = {}
+
+    def features(self, record):
+        rid = record["id"]
+        cached = self._features.get(rid)
+        if cached is None:
+            prompt = record.get("prompt", "")
+            tags = prompt_tags(prompt)
+            created = record.get("created_at") or 0
+            cached = self._features[rid] = {
+                "title": record.get("title", "").casefold(),
+                "created": created,
+                "modified": record.get("modified_at") or created,
+                "length": len(prompt),
+                "tags": len(tags),
+                "tag_set": frozenset(tags),
+            }
+        return cached
+
+    def invalidate(self, record_id=None):
+        if record_id is None: self._features.clear()
+        else: self._features.pop(record_id, None)
+
+
+def similarity(tag_set, reference_tags):
+    if not tag_set or not reference_tags: return 0.0
+    return len(tag_set & reference_tags) / len(tag_set | reference_tags)
+
+
+class SortedView:
+    # Kartların görüntülenme sırası. Anahtarlar önceden hesaplanıp sıralı bir listede
+    # tutulur; ekleme / düzenlemede konum ikili arama ile bulunur, tüm liste yeniden
+    # sıralanmaz. Eşit anahtarlarda banka sırası korunur (kararlı sıralama).
+    def __init__(self, mode="bank", descending=False, image_state=None):
+        self.mode = mode if mode in SORT_MODES else "bank"
+        self.descending = descending
+        self.image_state = image_state or (lambda record: bool(record.get("image_path")))
+        self.cache = SortKeyCache()
+        self.reference_tags = frozenset()
+        self.order = []
+        self._keys = []
+        self._key_by_id = {}
+        # Filtreden geçen kayıtların sıralı alt dizisi (grid bu listeyi gösterir). Liste
+        # nesnesi yerinde güncellenir, bu yüzden ona tutulan referanslar geçerli kalır.
+        self.predicate = None
+        self.visible = []
+        self._visible_keys = []
+        self._records = {}
+        # Banka sırası: kaydın prompts_list'teki yeri. rebuild() 0..n-1 olarak numaralar;
+        # araya geri eklenen kayıt (undo) komşularının numaraları arasına yerleştirilir.
+        self._seq_by_id = {}
+        self._next_seq = 0
+
+    def set_reference(self, record):
+        self.reference_tags = self.cache.features(record)["tag_set"] if record else frozenset()
+
+    def sort_key(self, record):
+        rid = record["id"]
+        seq = self._seq_by_id.get(rid)
+        if seq is None:
+            seq = self._seq_by_id[rid] = self._next_seq
+            self._next_seq += 1
+        if self.mode == "bank":
+            primary = seq
+        elif self.mode == "image":
+            # Önce resmi olanlar (True > False, bu yüzden ters)
+            primary = 0 if self.image_state(record) else 1
+        elif self.mode == "similarity":
+            primary = -similarity(self.cache.features(record)["tag_set"], self.reference_tags)
+        else:
+            primary = self.cache.features(record)[self.mode]
+        if self.descending: primary = Descending(primary)
+        return primary, seq
+
+    def matches(self, record):
+        return self.predicate is None or self.predicate(record)
+
+    def record(self, record_id):
+        return self._records.get(record_id)
+
+    def __contains__(self, record_id):
+        return record_id in self._key_by_id
+
+    def set_filter(self, predicate):
+        # Filtre değiştiğinde görünür alt dizi tek geçişte yeniden hesaplanır; anahtarlar hazır
+        self.predicate = predicate
+        self._refilter()
+        return self.visible
+
+    def _refilter(self):
+        if self.predicate is None:
+            self._visible_keys[:] = self._keys
+            self.visible[:] = self.order
+            return
+        pairs = [(key, rid) for key, rid in zip(self._keys, self.order) if self.predicate(self._records[rid])]
+        self._visible_keys[:] = [key for key, _ in pairs]
+        self.visible[:] = [rid for _, rid in pairs]
+
+    def rebuild(self, records):
+        # Yalnızca sıralama kipi değiştiğinde ya da ilk yüklemede tam sıralama yapılır
+        self._seq_by_id = {rec["id"]: i for i, rec in enumerate(records)}
+        self._next_seq = len(records)
+        self._records = {rec["id"]: rec for rec in records}
+        pairs = sorted(((self.sort_key(rec), rec["id"]) for rec in records), key=lambda pair: pair[0])
+        self._keys = [key for key, _ in pairs]
+        self.order = [rid for _, rid in pairs]
+        self._key_by_id = {rid: key for key, rid in pairs}
+        self._refilter()
+        return self.visible
+
+    def place(self, records, position):
+        # records[position] henüz eklenmemiş bir kayıtsa banka sırasındaki numarasını
+        # komşularına göre belirler; ardından insert() çağrılır. Komşular arasında yer
+        # kalmadıysa görünüm records'tan yeniden kurulur (kayıt da dahil) ve False döner.
+        low = high = None
+        for i in range(position - 1, -1, -1):
+            low = self._seq_by_id.get(records[i]["id"])
+            if low is not None: break
+        for i in range(position + 1, len(records)):
+            high = self._seq_by_id.get(records[i]["id"])
+            if high is not None: break
+        if high is None: seq = self._next_seq
+        elif low is None: seq = high - 1
+        else: seq = (low + high) / 2
+        if low is not None and high is not None and not low < seq < high:
+            self.rebuild(records)
+            return False
+        self._seq_by_id[records[position]["id"]] = seq
+        if high is None: self._next_seq += 1
+        return True
+
+    def insert(self, record):
+        # Görünür listedeki konumu döndürür; kayıt filtreye uymuyorsa None
+        rid = record["id"]
+        key = self.sort_key(record)
+        index = bisect.bisect_right(self._keys, key)
+        self._keys.insert(index, key)
+        self.order.insert(index, rid)
+        self._key_by_id[rid] = key
+        self._records[rid] = record
+        if not self.matches(record): return None
+        index = bisect.bisect_right(self._visible_keys, key)
+        self._visible_keys.insert(index, key)
+        self.visible.insert(index, rid)
+        return index
+
+    def remove(self, record_id):
+        # Görünür listeden çıkarıldığı konumu döndürür; görünür değilse None
+        key = self._key_by_id.pop(record_id, None)
+        if key is None: return None
+        index = _locate(self._keys, self.order, key, record_id)
+        del self._keys[index]
+        del self.order[index]
+        index = _locate(self._visible_keys, self.visible, key, record_id)
+        if index is None: return None
+        del self._visible_keys[index]
+        del self.visible[index]
+        return index
+
+    def update(self, record, invalidate=True):
+        # Kayıt değiştiğinde görünür listedeki (old_index, new_index) çiftini döndürür;
+        # anahtar ve filtre sonucu aynıysa yer değişmez. None: görünür değil.
+        rid = record["id"]
+        if invalidate: self.cache.invalidate(rid)
+        old_key = self._key_by_id.get(rid)
+        new_key = self.sort_key(record)
+        if old_key is not None and old_key == new_key:
+            index = _locate(self._visible_keys, self.visible, old_key, rid)
+            if (index is not None) == self.matches(record):
+                self._records[rid] = record
+                return index, index
+        old_index = self.remove(rid)
+        return old_index, self.insert(record)
+
+    def forget(self, record_id):
+        index = self.remove(record_id)
+        self.cache.invalidate(record_id)
+        self._seq_by_id.pop(record_id, None)
+        self._records.pop(record_id, None)
+        return index
+
+
+def _locate(keys, ids, key, record_id):
+    # Anahtarlar (birincil, sıra) çifti olduğundan eşit anahtar tek kayda aittir
+    index = bisect.bisect_left(keys, key)
+    while index < len(keys) and keys[index] == key:
+        if ids[index] == record_id: return index
+        index += 1
+    return None
@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+from utilities import SettingsManager, SETTINGS_FILE
+
+# Açılış bütçesi (ms). settings.json içindeki "startup_budget_ms" ile ya da
+# komut satırından (--budget faz=ms) değiştirilebilir.
+STARTUP_BUDGET_MS = {
+    "import": 600,
+    "data_load": 250,
+    "window_init": 1200,
+    "first_paint": 2000,
+    "process_total": 3500,
+}
+# Uygulama ölçümleri bu ortam değişkenindeki dosyaya yazar (pencereli pakette stdout yoktur)
+TIMINGS_ENV = "PROMPTDB_STARTUP_TIMINGS"
+
+
+def run_once(command, timeout):
+    fd, timings_path = tempfile.mkstemp(prefix="promptdb-startup-", suffix=".json")
+    os.close(fd)
+    env = dict(os.environ)
+    env[TIMINGS_ENV] = timings_path
+    try:
+        started = time.perf_counter()
+        proc = subprocess.run(command, env=env, capture_output=True, text=True, timeout=timeout)
+        total = time.perf_counter() - started
+        with open(timings_path, "r", encoding="utf-8") as f:
+            raw = f.read()
+    finally:
+        os.remove(timings_path)
+    if not raw.strip():
+        raise RuntimeError(f"No startup timings reported (exit code {proc.returncode}):\n{proc.stderr}")
+    timings = json.loads(raw)
+    timings["process_total"] = total
+    return timings
+
+
+def load_budget(overrides):
+    budget = dict(STARTUP_BUDGET_MS)
+    budget.update(SettingsManager(SETTINGS_FILE).get("startup_budget_ms", {}) or {})
+    for item in overrides:
+        phase, _, value = item.partition("=")
+        budget[phase] = float(value)
+    return budget
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure PROMPT-DB startup and check it against a budget.")
+    parser.add_argument("executable", nargs="?",
+                        help="packaged executable to launch (default: run main.py with this interpreter)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--budget", action="append", default=[], metavar="PHASE=MS")
+    args = parser.parse_args(argv)
+
+    command = [args.executable] if args.executable else [sys.executable, "main.py"]
+    budget = load_budget(args.budget)
+
+    runs = [run_once(command, args.timeout) for _ in range(args.runs)]
+    failures = []
+    print(f"{'phase':<14}{'median ms':>12}{'max ms':>10}{'budget':>10}")
+    for phase, limit in budget.items():
+        values = [r[phase] * 1000 for r in runs if phase in r]
+        if not values: continue
+        median = statistics.median(values)
+        status = "" if median <= limit else "  OVER"
+        print(f"{phase:<14}{median:>12.1f}{max(values):>10.1f}{limit:>10.0f}{status}")
+        if median > limit: failures.append(phase)
+
+    if any(r.get("dialogs_loaded") for r in runs):
+        print("dialogs module was imported during startup; it should load on first use")
+        failures.append("lazy_dialogs")
+
+    if failures:
+        print(f"Startup budget exceeded: {', '.join(failures)}")
+        return 1
+    print("Startup within budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
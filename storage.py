@@ -0,0 +1,229 @@
+import os
+import json
+import uuid
+import hashlib
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+RECORD_ID_NAMESPACE = uuid.UUID("6f1c2a4e-3b7d-4c1e-9a51-2d7f0e8b9c40")
+
+
+class FileLock:
+    # Aynı dosyaya yazan diğer pencereler / script'ler için advisory kilit.
+    # Kilit, veri dosyasının yanındaki ".lock" dosyası üzerinde tutulur.
+    def __init__(self, path):
+        self.lock_path = path + ".lock"
+        self._handle = None
+
+    def acquire(self):
+        self._handle = open(self.lock_path, "a+")
+        if fcntl is not None:
+            fcntl.flock(self._handle.fileno(), fcntl.LOCK_EX)
+        else:
+            self._handle.seek(0)
+            # LK_LOCK ~10 saniye boyunca tekrar dener, sonra OSError fırlatır
+            msvcrt.locking(self._handle.fileno(), msvcrt.LK_LOCK, 1)
+
+    def release(self):
+        if self._handle is None: return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+            else:
+                self._handle.seek(0)
+                msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._handle.close()
+            self._handle = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class StoreChanges:
+    # Diskteki değişikliklerin bellekteki listeye göre farkı (kart bazında uygulanır)
+    def __init__(self):
+        self.added = []
+        self.updated = []
+        self.removed = []
+
+    def __bool__(self):
+        return bool(self.added or self.updated or self.removed)
+
+    def __repr__(self):
+        return (f"StoreChanges(added={len(self.added)}, updated={len(self.updated)}, "
+                f"removed={len(self.removed)})")
+
+
+def normalize_record(prompt_data):
+    if "negative_prompt" not in prompt_data: prompt_data["negative_prompt"] = ""
+    if "is_negative" not in prompt_data: prompt_data["is_negative"] = bool(prompt_data["negative_prompt"])
+    if "is_positive" not in prompt_data:
+        prompt_data["is_positive"] = True
+    return prompt_data
+
+
+def new_record_id():
+    return uuid.uuid4().hex
+
+
+def assign_record_ids(records):
+    # ID'si olmayan kayıtlar (eski dosyalar, dış script'ler) başlıktan türetilen
+    # sabit bir ID alır; böylece aynı dosya tekrar okunduğunda ID'ler değişmez.
+    used = {rec["id"] for rec in records if rec.get("id")}
+    for rec in records:
+        if rec.get("id"): continue
+        rid = uuid.uuid5(RECORD_ID_NAMESPACE, rec.get("title", "")).hex
+        if rid in used: rid = new_record_id()
+        rec["id"] = rid
+        used.add(rid)
+    return records
+
+
+def _path_key(path):
+    return os.path.normcase(path.replace("\\", "/")).replace("\\", "/")
+
+
+def relink_image_paths(records, old_prefix, new_prefix):
+    # Taşınan bir klasörün önekini tüm kayıtlarda tek geçişte yeniden eşler.
+    # Değişen kayıtların listesini döndürür (kayıtlar yerinde güncellenir).
+    old_key = _path_key(old_prefix).rstrip("/")
+    new_prefix = new_prefix.replace("\\", "/").rstrip("/")
+    if not old_key: return []
+    changed = []
+    for rec in records:
+        image_path = rec.get("image_path", "")
+        if not image_path: continue
+        norm = image_path.replace("\\", "/")
+        key = _path_key(norm)
+        if key == old_key or key.startswith(old_key + "/"):
+            rec["image_path"] = new_prefix + norm[len(old_key):]
+            changed.append(rec)
+    return changed
+
+
+class PromptStore:
+    def __init__(self, filename):
+        self.filename = filename
+        self.lock = FileLock(filename)
+        self.records = []
+        self.generation = 0
+        self._synced = {}
+        self._disk_stat = None
+        self._disk_hash = None
+
+    def load(self):
+        self.records[:] = []
+        self._synced = {}
+        self._disk_stat = self._disk_hash = None
+        if not os.path.exists(self.filename): return self.records
+        raw = self._read_bytes()
+        self.records.extend(self._parse(raw))
+        self._mark_synced(self.records, raw)
+        return self.records
+
+    def save(self):
+        # Yazmadan önce diskteki dış değişiklikler bellekle birleştirilir;
+        # böylece son yazan diğerinin değişikliklerini sessizce ezmez.
+        with self.lock:
+            changes = StoreChanges()
+            # stat tek başına yetmez: mtime çözünürlüğü kaba olan dosya sistemlerinde
+            # (FAT, SMB) aynı boyutlu bir dış yazma fark edilmez; içerik hash'i karşılaştırılır
+            if os.path.exists(self.filename):
+                raw = self._read_bytes()
+                if hashlib.sha1(raw).hexdigest() != self._disk_hash:
+                    merged, changes = self._merge(self._parse(raw))
+                    self.records[:] = merged
+            raw = json.dumps(self.records, indent=4, ensure_ascii=False).encode("utf-8")
+            self._write_atomic(raw)
+            self._mark_synced(self.records, raw)
+        return changes
+
+    def check_external_changes(self):
+        # Ucuz yol: stat değişmediyse dosya okunmaz
+        if not self._disk_changed(): return None
+        with self.lock:
+            if not os.path.exists(self.filename):
+                return None
+            raw = self._read_bytes()
+            if hashlib.sha1(raw).hexdigest() == self._disk_hash:
+                self._disk_stat = self._stat()
+                return None
+            theirs = self._parse(raw)
+            merged, changes = self._merge(theirs)
+            self.records[:] = merged
+            self._mark_synced(theirs, raw)
+        return changes
+
+    def _parse(self, raw):
+        data = json.loads(raw.decode("utf-8")) if raw.strip() else []
+        for prompt_data in data:
+            normalize_record(prompt_data)
+        return assign_record_ids(data)
+
+    def _merge(self, theirs):
+        # Üç yönlü birleştirme: base = son senkron durum, ours = bellek, theirs = disk.
+        # Yerelde değişmemiş kayıtlarda disk kazanır, yerelde değişmişlerde bellek kazanır.
+        base = self._synced
+        ours_ids = {rec["id"] for rec in self.records}
+        theirs_by_id = {rec["id"]: rec for rec in theirs}
+        changes = StoreChanges()
+        merged = []
+
+        for rec in self.records:
+            rid = rec["id"]
+            locally_changed = base.get(rid) != rec
+            if rid in theirs_by_id:
+                external = theirs_by_id[rid]
+                if not locally_changed and external != rec:
+                    merged.append(external)
+                    changes.updated.append(external)
+                else:
+                    merged.append(rec)
+            elif rid in base and not locally_changed:
+                changes.removed.append(rec)
+            else:
+                merged.append(rec)
+
+        for rec in theirs:
+            rid = rec["id"]
+            if rid not in ours_ids and rid not in base:
+                merged.append(rec)
+                changes.added.append(rec)
+        return merged, changes
+
+    def _mark_synced(self, records, raw):
+        self._synced = {rec["id"]: dict(rec) for rec in records}
+        self._disk_hash = hashlib.sha1(raw).hexdigest()
+        self._disk_stat = self._stat()
+        self.generation += 1
+
+    def _stat(self):
+        try:
+            st = os.stat(self.filename)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _disk_changed(self):
+        return self._stat() != self._disk_stat
+
+    def _read_bytes(self):
+        with open(self.filename, "rb") as f:
+            return f.read()
+
+    def _write_atomic(self, raw):
+        tmp_path = self.filename + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.filename)
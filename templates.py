@@ -0,0 +1,336 @@
+import os
+import re
+import random
+
+from utilities import WILDCARDS_DIR
+
+# Şablon sözdizimi:
+#   {a|b|c}          alternatifler (iç içe olabilir)
+#   {3::a|b|0.5::c}  ağırlıklı alternatifler (ağırlık yalnızca rastgele seçimde kullanılır)
+#   __isim__         wildcards/isim.txt satırları ya da başlığı "isim" olan prompt
+#   \{ \} \| \\      kaçış karakterleri
+
+WILDCARD_RE = re.compile(r"__([A-Za-z0-9][A-Za-z0-9_\-/ ]*?)__")
+WEIGHT_RE = re.compile(r"\s*(\d+(?:\.\d+)?)::")
+TEMPLATE_HINT_RE = re.compile(r"(?<!\\)\{[^{}]*\||__[A-Za-z0-9][A-Za-z0-9_\-/ ]*?__")
+MAX_WILDCARD_DEPTH = 16
+
+
+class TemplateError(ValueError):
+    pass
+
+
+class Literal:
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+
+class Wildcard:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class Sequence:
+    __slots__ = ("parts",)
+
+    def __init__(self, parts):
+        self.parts = parts
+
+
+class Choice:
+    __slots__ = ("options", "weights")
+
+    def __init__(self, options, weights):
+        self.options = options
+        self.weights = weights
+
+
+def has_template_syntax(text):
+    return bool(text) and TEMPLATE_HINT_RE.search(text) is not None
+
+
+def wildcard_slug(name):
+    return re.sub(r"\s+", "_", name.strip().lower())
+
+
+class _Parser:
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+
+    def parse(self):
+        return self.parse_sequence(inside_choice=False)
+
+    def parse_sequence(self, inside_choice):
+        parts = []
+        buf = []
+        text = self.text
+        while self.pos < len(text):
+            ch = text[self.pos]
+            if ch == "\\" and self.pos + 1 < len(text):
+                buf.append(text[self.pos + 1])
+                self.pos += 2
+            elif ch == "{":
+                self._flush(buf, parts)
+                self.pos += 1
+                parts.append(self.parse_choice())
+            elif inside_choice and ch in "|}":
+                break
+            else:
+                buf.append(ch)
+                self.pos += 1
+        self._flush(buf, parts)
+        return Sequence(parts)
+
+    def parse_choice(self):
+        start = self.pos - 1
+        options = []
+        weights = []
+        while True:
+            match = WEIGHT_RE.match(self.text, self.pos)
+            if match:
+                weights.append(float(match.group(1)))
+                self.pos = match.end()
+            else:
+                weights.append(1.0)
+            options.append(self.parse_sequence(inside_choice=True))
+            if self.pos >= len(self.text):
+                raise TemplateError(f"Unclosed '{{' at position {start}")
+            ch = self.text[self.pos]
+            self.pos += 1
+            if ch == "}":
+                if sum(weights) <= 0:
+                    raise TemplateError(f"Choice at position {start} has no positive weight")
+                return Choice(options, weights)
+
+    def _flush(self, buf, parts):
+        if not buf: return
+        chunk = "".join(buf)
+        buf.clear()
+        last = 0
+        for match in WILDCARD_RE.finditer(chunk):
+            if match.start() > last: parts.append(Literal(chunk[last:match.start()]))
+            parts.append(Wildcard(wildcard_slug(match.group(1))))
+            last = match.end()
+        if last < len(chunk): parts.append(Literal(chunk[last:]))
+
+
+def parse_template(text):
+    return _Parser(text or "").parse()
+
+
+class WildcardLibrary:
+    # __isim__ referanslarını çözer: önce wildcards/ klasöründeki isim.txt dosyası,
+    # yoksa başlığı isimle eşleşen prompt kaydının pozitif prompt satırları.
+    def __init__(self, records=None, directory=WILDCARDS_DIR):
+        self.records = records if records is not None else []
+        self.directory = directory
+        self._file_cache = {}
+
+    def options(self, name):
+        lines = self._file_options(name)
+        if lines is None:
+            lines = self._record_options(name)
+        if lines is None: return None
+        weights = []
+        texts = []
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"): continue
+            match = WEIGHT_RE.match(line)
+            weights.append(float(match.group(1)) if match else 1.0)
+            texts.append(line[match.end():] if match else line)
+        return texts, weights
+
+    def _file_options(self, name):
+        path = os.path.join(self.directory, *name.split("/")) + ".txt"
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        cached = self._file_cache.get(path)
+        if cached and cached[0] == mtime: return cached[1]
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except Exception as e:
+            print(f"Error reading wildcard file {path}: {e}")
+            return None
+        self._file_cache[path] = (mtime, lines)
+        return lines
+
+    def _record_options(self, name):
+        for rec in self.records:
+            if wildcard_slug(rec.get("title", "")) == name:
+                return rec.get("prompt", "").splitlines()
+        return None
+
+
+class TemplateExpander:
+    # Şablonları tembel olarak genişletir. Kombinasyonlar hiçbir zaman bellekte
+    # topluca oluşturulmaz: iter_variants bir generator'dır, variant_at ise
+    # sıra numarasından doğrudan varyant üretir.
+    def __init__(self, library=None):
+        self.library = library or WildcardLibrary()
+        self._parsed = {}
+        self._wildcards = {}
+        self._counts = {}
+        self._resolving = []
+
+    def parse(self, text):
+        node = self._parsed.get(text)
+        if node is None:
+            node = self._parsed[text] = parse_template(text)
+        return node
+
+    def count(self, text):
+        return self._count(self.parse(text))
+
+    def iter_variants(self, text, limit=None):
+        node = self.parse(text)
+        # count() döngüsel wildcard'ları önceden yakalar; generator'lar yığın tutmaz
+        self._count(node)
+        produced = 0
+        for variant in self._expand(node):
+            if limit is not None and produced >= limit: return
+            yield variant
+            produced += 1
+
+    def variant_at(self, text, index):
+        node = self.parse(text)
+        total = self._count(node)
+        if not 0 <= index < total:
+            raise IndexError(f"Variant index {index} out of range (0..{total - 1})")
+        return self._unrank(node, index)
+
+    def sample(self, text, n, seed=None, weighted=True):
+        # weighted=True: {2::a|b} ağırlıklarına göre seçim (tekrar olabilir)
+        # weighted=False: tüm kombinasyonlar arasından tekrarsız düzgün örnekleme
+        rng = random.Random(seed)
+        node = self.parse(text)
+        if weighted:
+            return [self._random(node, rng) for _ in range(n)]
+        total = self._count(node)
+        return [self._unrank(node, i) for i in _sample_indices(rng, total, n)]
+
+    def write_variants(self, text, stream, limit=None, progress=None, progress_every=10000):
+        # Varyantları satır satır bir dosyaya / akışa yazar; progress(n) False dönerse durur
+        written = 0
+        for variant in self.iter_variants(text, limit):
+            stream.write(variant.replace("\r", " ").replace("\n", " "))
+            stream.write("\n")
+            written += 1
+            if progress is not None and written % progress_every == 0:
+                if progress(written) is False: break
+        return written
+
+    def _wildcard_node(self, name):
+        if name in self._resolving:
+            chain = " -> ".join(self._resolving + [name])
+            raise TemplateError(f"Recursive wildcard: {chain}")
+        if len(self._resolving) >= MAX_WILDCARD_DEPTH:
+            raise TemplateError(f"Wildcard nesting too deep at __{name}__")
+        node = self._wildcards.get(name)
+        if node is None:
+            resolved = self.library.options(name)
+            if resolved is None:
+                node = Literal("__" + name + "__")
+            else:
+                texts, weights = resolved
+                if texts and sum(weights) <= 0:
+                    raise TemplateError(f"Wildcard __{name}__ has no positive weight")
+                node = Choice([parse_template(t) for t in texts], weights)
+            self._wildcards[name] = node
+        return node
+
+    def _descend(self, node, func, *args):
+        # Wildcard içine girerken döngü tespiti için isim yığını tutulur
+        if isinstance(node, Wildcard):
+            target = self._wildcard_node(node.name)
+            self._resolving.append(node.name)
+            try:
+                return func(target, *args)
+            finally:
+                self._resolving.pop()
+        return func(node, *args)
+
+    def _count(self, node):
+        if isinstance(node, Literal): return 1
+        if isinstance(node, Wildcard):
+            cached = self._counts.get(node.name)
+            if cached is None:
+                cached = self._counts[node.name] = self._descend(node, self._count)
+            return cached
+        if isinstance(node, Sequence):
+            total = 1
+            for part in node.parts:
+                total *= self._count(part)
+            return total
+        if not node.options: return 1
+        return sum(self._count(option) for option in node.options)
+
+    def _expand(self, node):
+        if isinstance(node, Literal):
+            yield node.text
+        elif isinstance(node, Wildcard):
+            yield from self._expand(self._wildcards[node.name])
+        elif isinstance(node, Sequence):
+            yield from self._expand_parts(node.parts, 0)
+        elif not node.options:
+            yield ""
+        else:
+            for option in node.options:
+                yield from self._expand(option)
+
+    def _expand_parts(self, parts, index):
+        if index == len(parts):
+            yield ""
+            return
+        for head in self._expand(parts[index]):
+            for tail in self._expand_parts(parts, index + 1):
+                yield head + tail
+
+    def _unrank(self, node, index):
+        if isinstance(node, Literal): return node.text
+        if isinstance(node, Wildcard): return self._descend(node, self._unrank, index)
+        if isinstance(node, Sequence):
+            # Karışık tabanlı sayı: son parça en hızlı değişir (iter_variants ile aynı sıra)
+            pieces = []
+            for part in reversed(node.parts):
+                count = self._count(part)
+                index, sub = divmod(index, count)
+                pieces.append(self._unrank(part, sub))
+            return "".join(reversed(pieces))
+        if not node.options: return ""
+        for option in node.options:
+            count = self._count(option)
+            if index < count: return self._unrank(option, index)
+            index -= count
+        raise IndexError(index)
+
+    def _random(self, node, rng):
+        if isinstance(node, Literal): return node.text
+        if isinstance(node, Wildcard): return self._descend(node, self._random, rng)
+        if isinstance(node, Sequence):
+            return "".join(self._random(part, rng) for part in node.parts)
+        if not node.options: return ""
+        option = rng.choices(node.options, weights=node.weights)[0]
+        return self._random(option, rng)
+
+
+def _sample_indices(rng, total, n):
+    if n >= total: return range(total)
+    # random.sample(range(total)) ssize_t'yi aşan uzaylarda OverflowError verir;
+    # randrange sınırsız tamsayılarla çalışır. Yoğun örneklemede küçük aralık kullanılır.
+    if n * 2 > total: return rng.sample(range(total), n)
+    seen, indices = set(), []
+    while len(indices) < n:
+        index = rng.randrange(total)
+        if index not in seen:
+            seen.add(index)
+            indices.append(index)
+    return indices
@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QScrollArea, QWidget
+
+import themes
+from grid import CardGrid
+from layouts import QFlowLayout
+from sorting import SortedView
+from utilities import SettingsManager, Translator, SETTINGS_FILE
+from widgets import PromptCard
+
+# Hedef: 2000 kartlık bir bankada tema değişimi (yeniden çizim dahil) bu süreyi aşmamalı.
+# QApplication.setPalette her widget'a PaletteChange gönderdiği için maliyet widget sayısıyla
+# doğrusaldır; uygulamadaki gibi CardGrid ile yalnızca görünüre yakın kartlar oluşturulur.
+THEME_TOGGLE_BUDGET_MS = 50
+DEFAULT_CARD_COUNT = 2000
+
+
+def build_grid(card_count, translator):
+    # Uygulamadaki grid'in aynısı: kayıtlar SortedView'da, kartlar CardGrid sayfalarında
+    records = [{"id": str(i), "title": f"Prompt {i}", "prompt": "benchmark", "image_path": ""}
+               for i in range(card_count)]
+    view = SortedView()
+    view.rebuild(records)
+    scroll_area = QScrollArea()
+    scroll_area.setWidgetResizable(True)
+    content = QWidget()
+    scroll_area.setWidget(content)
+    layout = QFlowLayout(content)
+    grid = CardGrid(scroll_area, layout, view.visible,
+                    lambda record_id: PromptCard(view.record(record_id), translator),
+                    lambda record_ids: None)
+    scroll_area.resize(1600, 900)
+    scroll_area.show()
+    grid.reset()
+    return scroll_area, grid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark a PROMPT-DB theme toggle.")
+    parser.add_argument("--cards", type=int, default=DEFAULT_CARD_COUNT)
+    parser.add_argument("--toggles", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=THEME_TOGGLE_BUDGET_MS, metavar="MS")
+    args = parser.parse_args(argv)
+
+    app = QApplication(sys.argv[:1])
+    translator = Translator(SettingsManager(SETTINGS_FILE))
+    themes.install(app, False)
+    scroll_area, grid = build_grid(args.cards, translator)
+    for _ in range(10):
+        app.processEvents()
+
+    samples = []
+    is_dark = False
+    for _ in range(args.toggles):
+        is_dark = not is_dark
+        started = time.perf_counter()
+        themes.apply_theme(app, is_dark)
+        app.processEvents()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    median = statistics.median(samples)
+    print(f"{args.cards} cards ({len(grid.cards)} materialized), {args.toggles} toggles: "
+          f"median {median:.1f} ms, max {max(samples):.1f} ms (target {args.budget:.0f} ms)")
+    scroll_area.close()
+    return 0 if median <= args.budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
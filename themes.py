@@ -0,0 +1,144 @@
+import weakref
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QPalette, QColor, QFont
+
+# Tema, uygulama geneline QSS yerine QPalette ile uygulanır. Stylesheet olmadığı için
+# tema değişiminde Qt hiçbir kuralı yeniden ayrıştırmaz / widget'ları yeniden polish etmez;
+# yalnızca görünen widget'lar yeni paletle yeniden çizilir.
+
+THEME_COLORS = {
+    "light": {
+        "window": "#F0F0F0", "text": "#000000", "base": "#FFFFFF", "button": "#E0E0E0",
+        "border": "#C0C0C0", "card": "#FFFFFF", "card_border": "#DDDDDD",
+        "placeholder_bg": "#EEEEEE", "placeholder_text": "#888888",
+        "accent": "#007BFF", "accent_text": "#FFFFFF",
+        "positive_text": "#006400", "negative_text": "#B00000",
+    },
+    "dark": {
+        "window": "#2E2E2E", "text": "#E0E0E0", "base": "#3A3A3A", "button": "#4A4A4A",
+        "border": "#606060", "card": "#3A3A3A", "card_border": "#505050",
+        "placeholder_bg": "#404040", "placeholder_text": "#999999",
+        "accent": "#007BFF", "accent_text": "#FFFFFF",
+        "positive_text": "#A0F0A0", "negative_text": "#F0A0A0",
+    },
+}
+
+FONT_FAMILIES = ["Segoe UI", "Roboto", "Helvetica Neue", "Arial"]
+CARD_RADIUS = 8
+
+Role = QPalette.ColorRole
+
+# objectName -> kural. "colors": widget'a özel palet (temaya göre önbelleklenir),
+# "roles": uygulama paletindeki rollere bağlanır (tema değişiminde hiçbir şey yapılmaz).
+OBJECT_RULES = {
+    "CreateButton": {"colors": {Role.Button: "accent", Role.ButtonText: "accent_text"}, "bold": True},
+    "PositivePromptText": {"colors": {Role.Text: "positive_text"}},
+    "NegativePromptText": {"colors": {Role.Text: "negative_text"}},
+    "ImagePlaceholder": {"roles": (Role.AlternateBase, Role.PlaceholderText), "fill": True},
+    "ImageLabel": {"fill": False},
+}
+
+
+class _ThemeState:
+    def __init__(self):
+        self.name = "light"
+        self.palettes = {}
+        self.rule_palettes = {}
+        self.fonts = {}
+        # Özel paleti olan (az sayıdaki) widget'lar; tema değişiminde yalnız bunlara dokunulur
+        self.overridden = weakref.WeakSet()
+
+
+_state = _ThemeState()
+
+
+def theme_name(is_dark):
+    return "dark" if is_dark else "light"
+
+
+def color(key):
+    return QColor(THEME_COLORS[_state.name][key])
+
+
+def build_palette(name):
+    palette = _state.palettes.get(name)
+    if palette is not None: return palette
+    c = {key: QColor(value) for key, value in THEME_COLORS[name].items()}
+    palette = QPalette()
+    palette.setColor(Role.Window, c["window"])
+    palette.setColor(Role.WindowText, c["text"])
+    palette.setColor(Role.Base, c["base"])
+    palette.setColor(Role.AlternateBase, c["placeholder_bg"])
+    palette.setColor(Role.Text, c["text"])
+    palette.setColor(Role.PlaceholderText, c["placeholder_text"])
+    palette.setColor(Role.Button, c["button"])
+    palette.setColor(Role.ButtonText, c["text"])
+    palette.setColor(Role.ToolTipBase, c["base"])
+    palette.setColor(Role.ToolTipText, c["text"])
+    palette.setColor(Role.Highlight, c["accent"])
+    palette.setColor(Role.HighlightedText, c["accent_text"])
+    palette.setColor(Role.Mid, c["border"])
+    palette.setColor(Role.Midlight, c["card_border"])
+    palette.setColor(Role.Light, c["card"])
+    _state.palettes[name] = palette
+    return palette
+
+
+def _rule_palette(rule_name):
+    key = (_state.name, rule_name)
+    palette = _state.rule_palettes.get(key)
+    if palette is None:
+        palette = QPalette(build_palette(_state.name))
+        for role, color_key in OBJECT_RULES[rule_name]["colors"].items():
+            palette.setColor(role, color(color_key))
+        _state.rule_palettes[key] = palette
+    return palette
+
+
+def install(app, is_dark):
+    # Açılışta bir kez: stil, yazı tipi ve palet
+    app.setStyleSheet("")
+    app.setStyle("Fusion")
+    font = QFont(app.font())
+    font.setFamilies(FONT_FAMILIES)
+    app.setFont(font)
+    apply_theme(app, is_dark)
+
+
+def apply_theme(app, is_dark):
+    name = theme_name(is_dark)
+    if name == _state.name and app.property("promptdb_theme") == name: return
+    _state.name = name
+    app.setProperty("promptdb_theme", name)
+    app.setPalette(build_palette(name))
+    for widget in list(_state.overridden):
+        try:
+            polish(widget)
+        except RuntimeError:  # C++ nesnesi silinmiş
+            _state.overridden.discard(widget)
+
+
+def polish(widget):
+    rule = OBJECT_RULES.get(widget.objectName())
+    if rule is None: return
+    if "colors" in rule:
+        widget.setPalette(_rule_palette(widget.objectName()))
+        _state.overridden.add(widget)
+    if "roles" in rule:
+        background, foreground = rule["roles"]
+        widget.setBackgroundRole(background)
+        widget.setForegroundRole(foreground)
+    if "fill" in rule:
+        widget.setAutoFillBackground(rule["fill"])
+    if rule.get("bold"):
+        widget.setFont(bold_font(widget.font().pointSize()))
+
+
+def bold_font(point_size):
+    font = _state.fonts.get(point_size)
+    if font is None:
+        font = QFont(QApplication.font())
+        if point_size > 0: font.setPointSize(point_size)
+        font.setBold(True)
+        _state.fonts[point_size] = font
+    return font
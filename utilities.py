@@ -1,49 +1,42 @@
 import os
+import re
+import sys
 import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+compiled_assets = None
+if getattr(sys, "frozen", False):
+    try:
+        # build_assets.py tarafından üretilir (hızlı açılış paketi); yoksa kaynak dosyalar kullanılır
+        import compiled_assets
+    except ImportError:
+        pass
 
 DATA_FILE = "prompts_data.json"
 SETTINGS_FILE = "settings.json"
 TRANSLATIONS_FILE = "translations.json"
+WILDCARDS_DIR = "wildcards"
+HISTORY_FILE = "undo_history.jsonl"
+VERSIONS_FILE = "prompt_versions.jsonl"
+BASE_LANGUAGE = "en"
+
+IMAGE_STATUS_TTL = 300  # saniye
+IMAGE_STATUS_WORKERS = 8
+IMAGE_STATUS_BATCH = 64
+
+TAG_WEIGHT_RE = re.compile(r"^[\s(\[{]+|[\s)\]}]+$|:\s*[\d.]+\s*[)\]]*$")
+
+
+def prompt_tags(text):
+    # Virgülle ayrılmış prompt'u etiketlere böler: "((best quality:1.2))" -> "best quality"
+    tags = []
+    for chunk in re.split(r"[,\n]", text or ""):
+        tag = TAG_WEIGHT_RE.sub("", chunk.strip()).strip().lower()
+        if tag: tags.append(tag)
+    return tags
 
-LIGHT_THEME_QSS = """
-    QWidget { background-color: #F0F0F0; color: #000000; font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif; }
-    QMainWindow, QDialog { background-color: #F0F0F0; }
-    QPushButton { background-color: #E0E0E0; border: 1px solid #C0C0C0; padding: 5px 10px; border-radius: 5px; }
-    QPushButton:hover { background-color: #E8E8E8; }
-    QPushButton#CreateButton { background-color: #007BFF; color: white; border: none; font-weight: bold; }
-    QPushButton#CreateButton:hover { background-color: #0056b3; }
-    QTextEdit, QLineEdit { background-color: #FFFFFF; color: #000000; border: 1px solid #C0C0C0; border-radius: 5px; padding: 5px; }
-    QScrollArea { border: none; }
-    #PromptCard { background-color: #FFFFFF; border: 1px solid #DDD; border-radius: 8px; }
-    #ImagePlaceholder { background-color: #EEE; border: 1px solid #CCC; text-align: center; border-radius: 8px; color: #888; border-bottom-left-radius: 0; border-bottom-right-radius: 0;}
-    #ImageLabel { border-top-left-radius: 8px; border-top-right-radius: 8px; }
-    QCheckBox { color: #000000; }
-    QTextEdit#PositivePromptText { color: #006400; border: 1px solid #AADDAA; }
-    QTextEdit#NegativePromptText { color: #B00000; border: 1px solid #D9534F; }
-    QComboBox { background-color: #E0E0E0; border: 1px solid #C0C0C0; padding: 5px; border-radius: 5px; }
-    QComboBox::drop-down { border: none; }
-    QComboBox QAbstractItemView { background-color: #FFFFFF; border: 1px solid #C0C0C0; }
-"""
-
-DARK_THEME_QSS = """
-    QWidget { background-color: #2E2E2E; color: #E0E0E0; font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif; }
-    QMainWindow, QDialog { background-color: #2E2E2E; }
-    QPushButton { background-color: #4A4A4A; border: 1px solid #606060; padding: 5px 10px; border-radius: 5px; color: #E0E0E0; }
-    QPushButton:hover { background-color: #5A5A5A; }
-    QPushButton#CreateButton { background-color: #007BFF; color: white; border: none; font-weight: bold; }
-    QPushButton#CreateButton:hover { background-color: #0056b3; }
-    QTextEdit, QLineEdit { background-color: #3A3A3A; color: #E0E0E0; border: 1px solid #606060; padding: 5px; }
-    QScrollArea { border: none; }
-    #PromptCard { background-color: #3A3A3A; border: 1px solid #505050; border-radius: 8px; }
-    #ImagePlaceholder { background-color: #404040; border: 1px solid #606060; text-align: center; border-radius: 8px; color: #999; border-bottom-left-radius: 0; border-bottom-right-radius: 0;}
-    #ImageLabel { border-top-left-radius: 8px; border-top-right-radius: 8px; }
-    QCheckBox { color: #E0E0E0; }
-    QTextEdit#PositivePromptText { color: #A0F0A0; border: 1px solid #008000; }
-    QTextEdit#NegativePromptText { color: #F0A0A0; border: 1px solid #D9534F; }
-    QComboBox { background-color: #4A4A4A; border: 1px solid #606060; padding: 5px; border-radius: 5px; color: #E0E0E0; }
-    QComboBox::drop-down { border: none; }
-    QComboBox QAbstractItemView { background-color: #3A3A3A; border: 1px solid #606060; color: #E0E0E0; }
-"""
 
 class SettingsManager:
     def __init__(self, filename):
@@ -53,7 +46,10 @@ class SettingsManager:
     def load_settings(self):
         defaults = {
             "is_dark_theme": False,
-            "language": "en"
+            "language": "en",
+            "query_service_enabled": False,
+            "query_service_port": 8765,
+            "infinite_scroll": True
         }
         if not os.path.exists(self.filename): return defaults
         try:
@@ -79,29 +75,137 @@ class SettingsManager:
         self.settings[key] = value; self.save_settings()
 
 
+def compile_catalog(translations, base_language=BASE_LANGUAGE):
+    # Her dil için tek katmanlı, çözümlenmiş bir tablo üretir: eksik anahtarlar temel
+    # dilin metnine düşer. Ayrıca her dilde eksik olan anahtarları döndürür.
+    all_keys = set()
+    for table in translations.values():
+        all_keys.update(table)
+    base = translations.get(base_language, {})
+    tables, missing = {}, {}
+    for lang, table in translations.items():
+        resolved = dict(base)
+        resolved.update(table)
+        tables[lang] = resolved
+        absent = sorted(all_keys - set(table))
+        if absent: missing[lang] = absent
+    return tables, missing
+
+
 class Translator:
     def __init__(self, settings_manager):
         self.settings_manager = settings_manager
         self.translations = {};
+        self.tables = {}
+        self.missing_keys = {}
+        self._reported = set()
         self.load_translations()
         self.current_lang = self.settings_manager.get("language", "en")
+        self.table = self.tables.get(self.current_lang) or self.tables.get(BASE_LANGUAGE, {})
 
     def load_translations(self):
+        if compiled_assets is not None:
+            # build_assets.py tabloları derleme sırasında çözümlemiştir
+            self.translations = compiled_assets.TRANSLATIONS
+            self.tables = getattr(compiled_assets, "TRANSLATION_TABLES", None) or compile_catalog(self.translations)[0]
+            return
         if not os.path.exists(TRANSLATIONS_FILE): print(f"Error: {TRANSLATIONS_FILE} not found!"); return
         try:
             with open(TRANSLATIONS_FILE, "r", encoding="utf-8") as f:
                 self.translations = json.load(f)
         except Exception as e:
             print(f"Error loading translations: {e}")
+        self.tables, self.missing_keys = compile_catalog(self.translations)
+        for lang, keys in self.missing_keys.items():
+            print(f"Warning: {len(keys)} translation key(s) missing for '{lang}': {', '.join(keys)}")
 
     def get(self, key):
-        return self.translations.get(self.current_lang, {}).get(key, key)
+        # Tek sözlük araması; tablo dil değişiminde bir kez seçilir
+        try:
+            return self.table[key]
+        except KeyError:
+            if key not in self._reported:
+                self._reported.add(key)
+                print(f"Warning: unknown translation key '{key}'")
+            return key
 
     def set_language(self, lang_code):
-        if lang_code in self.translations:
-            self.current_lang = lang_code; self.settings_manager.set("language", lang_code)
+        if lang_code in self.tables:
+            self.current_lang = lang_code; self.table = self.tables[lang_code]
+            self.settings_manager.set("language", lang_code)
         else:
             print(f"Warning: Language '{lang_code}' not found in translations.")
 
     def get_current_language(self):
-        return self.current_lang
\ No newline at end of file
+        return self.current_lang
+
+class ImageStatusCache:
+    # Resim yollarının var olup olmadığını TTL ile önbellekler. Ağ sürücülerinde
+    # os.path.exists yavaş olduğu için kontroller GUI thread yerine havuzda, toplu yapılır.
+    def __init__(self, ttl=IMAGE_STATUS_TTL, max_workers=IMAGE_STATUS_WORKERS):
+        self.ttl = ttl
+        self._entries = {}
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-status")
+
+    def get(self, path):
+        # Bloklamaz: True / False ya da henüz bilinmiyorsa None
+        if not path: return False
+        with self._lock:
+            entry = self._entries.get(path)
+        return entry[0] if entry else None
+
+    def exists(self, path):
+        # Tek bir yol için bloklayan sürüm (diyaloglar için); taze değer varsa stat yapılmaz
+        if not path: return False
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry and time.monotonic() - entry[1] < self.ttl: return entry[0]
+        result = os.path.exists(path)
+        with self._lock:
+            self._entries[path] = (result, time.monotonic())
+        return result
+
+    def stale_paths(self, paths):
+        now = time.monotonic()
+        with self._lock:
+            return [p for p in set(paths) if p and p not in self._pending and
+                    (p not in self._entries or now - self._entries[p][1] >= self.ttl)]
+
+    def invalidate(self, paths=None):
+        with self._lock:
+            if paths is None: self._entries.clear()
+            else:
+                for p in paths: self._entries.pop(p, None)
+
+    def check_many(self, paths, callback):
+        # Eskimiş yollar parçalara bölünüp havuzda kontrol edilir; callback her parça
+        # için {yol: var_mı} sözlüğüyle worker thread'den çağrılır.
+        paths = self.stale_paths(paths)
+        if not paths: return 0
+        with self._lock:
+            self._pending.update(paths)
+        for i in range(0, len(paths), IMAGE_STATUS_BATCH):
+            self._executor.submit(self._check_batch, paths[i:i + IMAGE_STATUS_BATCH], callback)
+        return len(paths)
+
+    def _check_batch(self, paths, callback):
+        results = {}
+        for p in paths:
+            try:
+                results[p] = os.path.exists(p)
+            except Exception:
+                results[p] = False
+        now = time.monotonic()
+        with self._lock:
+            for p, exists in results.items():
+                self._entries[p] = (exists, now)
+            self._pending.difference_update(paths)
+        try:
+            callback(results)
+        except Exception as e:
+            print(f"Error delivering image statuses: {e}")
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,179 @@
+import os
+import re
+import json
+import zlib
+import base64
+import difflib
+
+from storage import FileLock
+from utilities import prompt_tags
+
+SNAPSHOT_INTERVAL = 10  # her N. sürüm tam kopya olarak saklanır
+VERSIONED_FIELDS = ("title", "prompt", "negative_prompt", "image_path")
+
+# Sürüm günlüğü biçimi (JSONL, yalnızca ekleme):
+#   {"id": ..., "v": 1, "t": zaman, "kind": "snapshot", "z" | "data": {alan: metin}}
+#   {"id": ..., "v": 2, "t": zaman, "kind": "delta", "z" | "data": {alan: [işlemler]}}
+# Delta yalnızca değişen alanları, alan başına kelime işlemleriyle tutar:
+#   n (int): önceki metinden n parçayı koru, -n: n parçayı atla, "metin": ekle
+# Sıkıştırma (zlib + base64 "z") yalnızca gerçekten küçültüyorsa kullanılır.
+
+TOKEN_RE = re.compile(r"\s+|[^\s,]+|,")
+
+
+def tokenize(text):
+    # Kelime, virgül ve boşluk parçaları; birleştirildiklerinde metni aynen verir
+    return TOKEN_RE.findall(text or "")
+
+
+def make_delta(old, new):
+    a, b = tokenize(old), tokenize(new)
+    ops = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append(i2 - i1)
+            continue
+        if i2 > i1: ops.append(i1 - i2)
+        if j2 > j1: ops.append("".join(b[j1:j2]))
+    return ops
+
+
+def apply_delta(old, ops):
+    tokens = tokenize(old)
+    position, parts = 0, []
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        elif op > 0:
+            parts.extend(tokens[position:position + op])
+            position += op
+        else:
+            position -= op
+    return "".join(parts)
+
+
+def word_diff(old, new):
+    # [(işlem, metin)], işlem: "equal" / "insert" / "delete"
+    a, b = tokenize(old), tokenize(new)
+    chunks = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            chunks.append(("equal", "".join(a[i1:i2])))
+            continue
+        if i2 > i1: chunks.append(("delete", "".join(a[i1:i2])))
+        if j2 > j1: chunks.append(("insert", "".join(b[j1:j2])))
+    return chunks
+
+
+def tag_diff(old, new):
+    # Etiket düzeyinde: yeni sıradaki etiketler "equal" / "insert", ardından silinenler
+    old_tags, new_tags = prompt_tags(old), prompt_tags(new)
+    old_set, new_set = set(old_tags), set(new_tags)
+    chunks = [("equal" if tag in old_set else "insert", tag) for tag in dict.fromkeys(new_tags)]
+    chunks += [("delete", tag) for tag in dict.fromkeys(old_tags) if tag not in new_set]
+    return chunks
+
+
+def version_fields(record):
+    return {key: record.get(key) or "" for key in VERSIONED_FIELDS}
+
+
+def _pack(payload):
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    packed = base64.b64encode(zlib.compress(raw.encode("utf-8"), 9)).decode("ascii")
+    return {"z": packed} if len(packed) < len(raw) else {"data": payload}
+
+
+def _unpack(entry):
+    if "z" in entry:
+        return json.loads(zlib.decompress(base64.b64decode(entry["z"])).decode("utf-8"))
+    return entry["data"]
+
+
+class VersionStore:
+    # Prompt başına sürüm geçmişi. Her kayıtta önceki sürüme göre kelime düzeyinde
+    # sıkıştırılmış bir delta eklenir; her SNAPSHOT_INTERVAL sürümde bir tam kopya
+    # yazılır, böylece bir sürüm en fazla SNAPSHOT_INTERVAL - 1 delta ile kurulur.
+    # Dosya ilk kullanımda okunur; başka bir pencere yazdıysa dizin yeniden yüklenir.
+    def __init__(self, filename, snapshot_interval=SNAPSHOT_INTERVAL):
+        self.filename = filename
+        self.snapshot_interval = snapshot_interval
+        self._entries = None
+        self._latest = {}
+        self._size = -1
+
+    def _ensure_loaded(self):
+        size = os.path.getsize(self.filename) if os.path.exists(self.filename) else 0
+        if self._entries is not None and size == self._size: return
+        entries = {}
+        try:
+            if size:
+                with open(self.filename, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if not line.strip(): continue
+                        entry = json.loads(line)
+                        entries.setdefault(entry["id"], []).append(entry)
+        except Exception as e:
+            print(f"Error loading version history: {e}")
+        self._entries, self._latest, self._size = entries, {}, size
+
+    def versions(self, record_id):
+        # [(sürüm, zaman)], eskiden yeniye
+        self._ensure_loaded()
+        return [(entry["v"], entry["t"]) for entry in self._entries.get(record_id, [])]
+
+    def get(self, record_id, version):
+        self._ensure_loaded()
+        entries = self._entries.get(record_id, [])
+        index = next((i for i, entry in enumerate(entries) if entry["v"] == version), None)
+        if index is None: return None
+        base = index
+        while entries[base]["kind"] != "snapshot": base -= 1
+        fields = dict(_unpack(entries[base]))
+        for entry in entries[base + 1:index + 1]:
+            for key, ops in _unpack(entry).items():
+                fields[key] = apply_delta(fields.get(key, ""), ops)
+        return fields
+
+    def latest(self, record_id):
+        cached = self._latest.get(record_id)
+        if cached is None:
+            entries = self._entries.get(record_id)
+            if not entries: return 0, None
+            cached = self._latest[record_id] = (entries[-1]["v"], self.get(record_id, entries[-1]["v"]))
+        return cached
+
+    def record(self, records, timestamp=None):
+        # Kayıtların şu anki hâllerini yeni sürümler olarak ekler (tek kilit, tek yazma).
+        # Sürümlenen alanları değişmemiş kayıtlar atlanır; eklenen sürüm sayısını döndürür.
+        with FileLock(self.filename):
+            self._ensure_loaded()
+            added = []
+            for record in records:
+                fields = version_fields(record)
+                version, previous = self.latest(record["id"])
+                if previous == fields: continue
+                version += 1
+                entry = {"id": record["id"], "v": version,
+                         "t": timestamp or record.get("modified_at") or record.get("created_at") or 0}
+                if previous is None or version % self.snapshot_interval == 1:
+                    entry["kind"] = "snapshot"
+                    entry.update(_pack(fields))
+                else:
+                    entry["kind"] = "delta"
+                    entry.update(_pack({key: make_delta(previous[key], value)
+                                        for key, value in fields.items() if value != previous[key]}))
+                added.append(entry)
+                self._latest[record["id"]] = (version, fields)
+                self._entries.setdefault(record["id"], []).append(entry)
+            if not added: return 0
+            try:
+                with open(self.filename, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+                                    for entry in added))
+                self._size = os.path.getsize(self.filename)
+            except Exception as e:
+                print(f"Error saving version history: {e}")
+                self._entries = None  # bellekteki dizin dosyadan yeniden kurulur
+                return 0
+        return len(added)
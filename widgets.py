@@ -1,12 +1,103 @@
 import os
-import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTextEdit, QDialog, QLineEdit, QFileDialog, QCheckBox,
-    QMessageBox, QSizePolicy, QApplication
+    QMessageBox, QSizePolicy
 )
-from PyQt6.QtGui import QPixmap
-from PyQt6.QtCore import Qt, pyqtSignal, QSize
+from PyQt6.QtGui import QPixmap, QImage, QPainter, QPen
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QRectF
+
+import themes
+
+
+CARD_IMAGE_WIDTH = 450
+CARD_IMAGE_HEIGHT = 253
+THUMBNAIL_CACHE_SIZE = 512
+THUMBNAIL_WORKERS = 2
+
+
+def __getattr__(name):
+    # Diyaloglar dialogs.py'ye taşındı ve ilk kullanımda yüklenir (hızlı açılış)
+    if name in ("CreatePromptDialog", "DetailsDialog"):
+        import dialogs
+        return getattr(dialogs, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def load_thumbnail(image_path):
+    # Kart boyutuna ölçeklenip ortadan kırpılmış resim. QPixmap'in aksine QImage
+    # GUI thread dışında da kullanılabilir, bu yüzden worker thread'lerden çağrılabilir.
+    image = QImage(image_path)
+    if image.isNull(): return None
+    scaled = image.scaled(CARD_IMAGE_WIDTH, CARD_IMAGE_HEIGHT,
+                          Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                          Qt.TransformationMode.SmoothTransformation)
+    x = (scaled.width() - CARD_IMAGE_WIDTH) // 2
+    y = (scaled.height() - CARD_IMAGE_HEIGHT) // 2
+    return scaled.copy(x, y, CARD_IMAGE_WIDTH, CARD_IMAGE_HEIGHT)
+
+
+class ThumbnailCache:
+    # Kart resimlerinin çözülmüş / ölçeklenmiş hâlleri (LRU). Grid bir sonraki sayfanın
+    # resimlerini prefetch() ile havuzda önceden hazırlar; kart oluşturulurken hazırsa
+    # dosya GUI thread'de yeniden okunmaz.
+    def __init__(self, max_items=THUMBNAIL_CACHE_SIZE, max_workers=THUMBNAIL_WORKERS):
+        self.max_items = max_items
+        self._images = OrderedDict()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbnails")
+
+    def get(self, path):
+        # Bloklamaz: hazır değilse None
+        with self._lock:
+            image = self._images.get(path)
+            if image is not None: self._images.move_to_end(path)
+        return image
+
+    def load(self, path):
+        # Bloklayan sürüm: önbellekte yoksa resmi bu thread'de yükler
+        image = self.get(path)
+        if image is None:
+            image = load_thumbnail(path)
+            if image is not None: self._store(path, image)
+        return image
+
+    def prefetch(self, paths):
+        with self._lock:
+            paths = [p for p in dict.fromkeys(paths) if p and p not in self._images and p not in self._pending]
+            self._pending.update(paths)
+        for p in paths:
+            self._executor.submit(self._load_async, p)
+        return len(paths)
+
+    def _load_async(self, path):
+        try:
+            image = load_thumbnail(path)
+        except Exception as e:
+            print(f"Error loading thumbnail {path}: {e}")
+            image = None
+        with self._lock:
+            self._pending.discard(path)
+        if image is not None: self._store(path, image)
+
+    def _store(self, path, image):
+        with self._lock:
+            self._images[path] = image
+            self._images.move_to_end(path)
+            while len(self._images) > self.max_items:
+                self._images.popitem(last=False)
+
+    def invalidate(self, paths=None):
+        with self._lock:
+            if paths is None: self._images.clear()
+            else:
+                for p in paths: self._images.pop(p, None)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
 
 class ThemeToggleButton(QPushButton):
@@ -23,10 +114,8 @@ class ThemeToggleButton(QPushButton):
         self.update_text()
 
     def update_text(self):
-        if self.isChecked():
-            self.setText(self.translator.get("☀️"))
-        else:
-            self.setText(self.translator.get("🌙"))
+        # Simgeler çevrilmez (çeviri tablosunda anahtar değildirler)
+        self.setText("☀️" if self.isChecked() else "🌙")
 
     def is_dark_mode(self):
         return self.isChecked()
@@ -36,257 +125,24 @@ class ThemeToggleButton(QPushButton):
         self.update_text()
 
 
-class CreatePromptDialog(QDialog):
-    prompt_created = pyqtSignal(dict)
-
-    def __init__(self, translator, parent=None, existing_data=None):
-        super().__init__(parent);
-        self.translator = translator;
-        self.existing_data = existing_data
-        self.setMinimumWidth(400);
-        self.setLayout(QVBoxLayout())
-
-        self.title_label = QLabel();
-        self.title_input = QLineEdit()
-
-        self.positive_prompt_check = QCheckBox()
-        self.positive_prompt_check.clicked.connect(self.toggle_positive_prompt_input)
-
-        self.prompt_label = QLabel()
-        self.prompt_input = QTextEdit()
-        self.prompt_input.setMinimumHeight(100);
-        self.prompt_input.setObjectName("PositivePromptText")
-
-        self.negative_prompt_check = QCheckBox()
-        self.negative_prompt_check.clicked.connect(self.toggle_negative_prompt_input)
-        self.negative_prompt_input = QTextEdit()
-        self.negative_prompt_input.setMinimumHeight(70);
-        self.negative_prompt_input.hide()
-        self.negative_prompt_input.setObjectName("NegativePromptText")
-
-        self.image_path = ""
-        self.image_label = QLabel()
-        self.image_button = QPushButton()
-        self.image_button.clicked.connect(self.select_image)
-
-        self.download_button = QPushButton()
-        self.download_button.clicked.connect(self.download_image)
-        self.download_button.hide()
-
-        self.save_button = QPushButton();
-        self.save_button.clicked.connect(self.save_and_close)
-
-        self.layout().addWidget(self.title_label);
-        self.layout().addWidget(self.title_input)
-
-        self.layout().addWidget(self.positive_prompt_check)
-        self.layout().addWidget(self.prompt_label);
-        self.layout().addWidget(self.prompt_input)
-
-        self.layout().addWidget(self.negative_prompt_check);
-        self.layout().addWidget(self.negative_prompt_input)
-
-        image_layout = QHBoxLayout()
-        image_layout.addWidget(self.image_button)
-        image_layout.addWidget(self.download_button)
-        image_layout.addStretch()
-        image_layout.addWidget(self.image_label)
-        self.layout().addLayout(image_layout)
-
-        self.layout().addWidget(self.save_button)
-
-        if self.existing_data:
-            self.populate_fields()
-        else:
-            self.positive_prompt_check.setChecked(True)
-
-        self.retranslate_ui()
-        self.toggle_positive_prompt_input()
-        self.toggle_negative_prompt_input()
-
-    def retranslate_ui(self):
-        if self.existing_data:
-            self.setWindowTitle(self.translator.get("dialog_edit_title"))
-        else:
-            self.setWindowTitle(self.translator.get("dialog_create_title"))
-        self.title_label.setText(self.translator.get("label_title"));
-        self.prompt_label.setText(self.translator.get("label_prompt"))
-        if not self.image_path: self.image_label.setText(self.translator.get("label_no_image"))
-        self.image_button.setText(self.translator.get("button_select_image"));
-        self.save_button.setText(self.translator.get("button_save"))
-        self.positive_prompt_check.setText(self.translator.get("checkbox_positive"))
-        self.negative_prompt_check.setText(self.translator.get("checkbox_negative"));
-        self.negative_prompt_input.setPlaceholderText(self.translator.get("placeholder_negative"))
-        self.download_button.setText(self.translator.get("button_download_image"))
-
-    def populate_fields(self):
-        self.title_input.setText(self.existing_data.get("title", ""));
-
-        is_positive = self.existing_data.get("is_positive", True)
-        self.positive_prompt_check.setChecked(is_positive)
-        self.prompt_input.setPlainText(self.existing_data.get("prompt", ""))
-
-        self.image_path = self.existing_data.get("image_path", "")
-        if self.image_path and os.path.exists(self.image_path):
-            self.image_label.setText(os.path.basename(self.image_path))
-            self.download_button.show()
-        else:
-            self.image_label.setText(self.translator.get("label_no_image"))
-            self.download_button.hide()
-
-        is_negative = self.existing_data.get("is_negative", False);
-        self.negative_prompt_check.setChecked(is_negative)
-        if is_negative: self.negative_prompt_input.setPlainText(
-            self.existing_data.get("negative_prompt", ""));
-
-    def toggle_positive_prompt_input(self):
-        is_visible = self.positive_prompt_check.isChecked()
-        self.prompt_label.setVisible(is_visible)
-        self.prompt_input.setVisible(is_visible)
-
-    def toggle_negative_prompt_input(self):
-        self.negative_prompt_input.setVisible(self.negative_prompt_check.isChecked())
-
-    def select_image(self):
-        title = self.translator.get("file_dialog_title");
-        filter = self.translator.get("file_dialog_filter")
-        file_name, _ = QFileDialog.getOpenFileName(self, title, "", filter)
-        if file_name:
-            self.image_path = file_name
-            self.image_label.setText(os.path.basename(file_name))
-            self.download_button.show()
-
-    def download_image(self):
-        if not self.image_path or not os.path.exists(self.image_path):
-            print("Download Error: No image path or file not found.")
-            return
-        title = self.translator.get("file_dialog_save_title");
-        filter = self.translator.get("file_dialog_save_filter")
-        original_filename = os.path.basename(self.image_path)
-        save_path, _ = QFileDialog.getSaveFileName(self, title, original_filename, filter)
-        if save_path:
-            try:
-                shutil.copy(self.image_path, save_path);
-                print(f"Image saved to: {save_path}")
-            except Exception as e:
-                print(f"Error saving image: {e}")
-
-    def get_data_from_fields(self):
-        is_positive = self.positive_prompt_check.isChecked()
-        is_negative = self.negative_prompt_check.isChecked()
-
-        return {
-            "title": self.title_input.text(),
-            "is_positive": is_positive,
-            "prompt": self.prompt_input.toPlainText() if is_positive else "",
-            "image_path": self.image_path,
-            "is_negative": is_negative,
-            "negative_prompt": self.negative_prompt_input.toPlainText() if is_negative else ""
-        }
-
-    def save_and_close(self):
-        new_data = self.get_data_from_fields()
-
-        if not new_data["title"]:
-            print(self.translator.get("error_validation_failed"))
-            QMessageBox.warning(self, "Validation Error", self.translator.get("error_validation_failed"))
-            return
-
-        has_image = bool(new_data["image_path"])
-        has_positive = is_positive = self.positive_prompt_check.isChecked() and bool(new_data["prompt"])
-        has_negative = self.negative_prompt_check.isChecked() and bool(new_data["negative_prompt"])
-
-        if not (has_image or has_positive or has_negative):
-            print(self.translator.get("error_validation_failed"))
-            QMessageBox.warning(self, "Validation Error", self.translator.get("error_validation_failed"))
-            return
-
-        if not self.existing_data:
-            self.prompt_created.emit(new_data)
-        self.accept()
-
-
-class DetailsDialog(QDialog):
-    def __init__(self, translator, prompt_data, parent=None):
-        super().__init__(parent)
-        self.translator = translator
-        self.prompt_data = prompt_data
-
-        self.setLayout(QVBoxLayout())
-        self.setMinimumWidth(500)
-
-        title = self.prompt_data.get("title", "No Title")
-        prompt_text = self.prompt_data.get("prompt", "")
-        is_positive = self.prompt_data.get("is_positive", True)
-        is_negative = self.prompt_data.get("is_negative", False)
-        negative_prompt_text = self.prompt_data.get("negative_prompt", "")
-
-        self.title_label = QLabel(title)
-        self.title_label.setStyleSheet("font-size: 16pt; font-weight: bold;")
-        self.title_label.setWordWrap(True)
-        self.layout().addWidget(self.title_label)
-
-        self.copy_pos_button = QPushButton()
-        self.copy_pos_button.clicked.connect(self.copy_positive)
-
-        if is_positive and prompt_text:
-            self.prompt_text_area = QTextEdit()
-            self.prompt_text_area.setPlainText(prompt_text)
-            self.prompt_text_area.setReadOnly(True)
-            self.prompt_text_area.setObjectName("PositivePromptText")
-            self.prompt_text_area.setMinimumHeight(150)
-            self.layout().addWidget(self.prompt_text_area)
-            self.layout().addWidget(self.copy_pos_button)
-        else:
-            self.copy_pos_button.hide()
-
-        self.copy_neg_button = QPushButton()
-        self.copy_neg_button.clicked.connect(self.copy_negative)
-
-        if is_negative and negative_prompt_text:
-            self.negative_prompt_text_area = QTextEdit()
-            prefix = self.translator.get("prefix_negative")
-            self.negative_prompt_text_area.setPlainText(f"{prefix}{negative_prompt_text}")
-            self.negative_prompt_text_area.setReadOnly(True)
-            self.negative_prompt_text_area.setObjectName("NegativePromptText")
-            self.negative_prompt_text_area.setMinimumHeight(100)
-            self.layout().addWidget(self.negative_prompt_text_area)
-            self.layout().addWidget(self.copy_neg_button)
-        else:
-            self.copy_neg_button.hide()
-
-        self.close_button = QPushButton()
-        self.close_button.clicked.connect(self.accept)
-        self.layout().addWidget(self.close_button)
-
-        self.retranslate_ui()
-
-    def retranslate_ui(self):
-        self.setWindowTitle(self.translator.get("dialog_details_title"))
-        self.close_button.setText(self.translator.get("button_close"))
-        self.copy_pos_button.setText(self.translator.get("button_copy_positive"))
-        self.copy_neg_button.setText(self.translator.get("button_copy_negative"))
-
-    def copy_positive(self):
-        clipboard = QApplication.clipboard()
-        clipboard.setText(self.prompt_data.get("prompt", ""))
-        print("Positive prompt copied to clipboard.")
-
-    def copy_negative(self):
-        clipboard = QApplication.clipboard()
-        clipboard.setText(self.prompt_data.get("negative_prompt", ""))
-        print("Negative prompt copied to clipboard.")
-
-
 class PromptCard(QWidget):
     edit_requested = pyqtSignal(QWidget)
     delete_requested = pyqtSignal(QWidget)
 
-    def __init__(self, prompt_data, translator):
+    def __init__(self, prompt_data, translator, image_cache=None, wildcard_library=None, thumbnails=None,
+                 versions=None):
         super().__init__()
         self.setObjectName("PromptCard")
         self.prompt_data = prompt_data
         self.translator = translator
+        self.image_cache = image_cache
+        self.wildcard_library = wildcard_library
+        self.thumbnails = thumbnails
+        self.versions = versions
+        # None: durum henüz bilinmiyor (arka planda kontrol ediliyor)
+        self.image_available = None
+        # Metinlerin en son hangi dilde yazıldığı (dil değişiminde tembel çeviri için)
+        self.language = None
         self.setFixedWidth(450)
 
         self.main_layout = QVBoxLayout(self)
@@ -308,26 +164,11 @@ class PromptCard(QWidget):
         card_layout.setSpacing(0)
 
         title = self.prompt_data.get("title", "No Title")
-        image_path = self.prompt_data.get("image_path", "")
 
         self.image_label = QLabel()
-        image_width = 450;
-        image_height = 253
-        self.image_label.setFixedSize(image_width, image_height)
-
-        if image_path and os.path.exists(image_path):
-            pixmap_original = QPixmap(image_path)
-            pixmap_scaled = pixmap_original.scaled(image_width, image_height,
-                                                   Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                                                   Qt.TransformationMode.SmoothTransformation)
-            x = (pixmap_scaled.width() - image_width) / 2;
-            y = (pixmap_scaled.height() - image_height) / 2
-            pixmap_cropped = pixmap_scaled.copy(int(x), int(y), image_width, image_height)
-            self.image_label.setPixmap(pixmap_cropped);
-            self.image_label.setObjectName("ImageLabel")
-        else:
-            self.image_label.setObjectName("ImagePlaceholder");
-            self.image_label.setText(self.translator.get("placeholder_image"))
+        self.image_label.setFixedSize(CARD_IMAGE_WIDTH, CARD_IMAGE_HEIGHT)
+        self.image_available = self.lookup_image_status()
+        self.render_image()
         card_layout.addWidget(self.image_label)
 
         # --- DEĞİŞİKLİK: Başlık (Title) alanı için layout değiştirildi ---
@@ -342,7 +183,7 @@ class PromptCard(QWidget):
 
         # Başlık etiketi
         self.title_label = QLabel(title)
-        self.title_label.setStyleSheet("font-size: 15pt; font-weight: bold;")
+        self.title_label.setFont(themes.bold_font(15))
         self.title_label.setWordWrap(True)
         # Başlığı dikey layout'a ekle (tam genişlik kullanır)
         title_bar_main_layout.addWidget(self.title_label)
@@ -382,8 +223,43 @@ class PromptCard(QWidget):
 
         self.retranslate_card_buttons()
 
+    def lookup_image_status(self):
+        image_path = self.prompt_data.get("image_path", "")
+        if not image_path: return False
+        if self.image_cache is None: return os.path.exists(image_path)
+        return self.image_cache.get(image_path)
+
+    def render_image(self):
+        image_path = self.prompt_data.get("image_path", "")
+        if self.image_available:
+            # Grid sonraki sayfayı önceden yüklediyse resim önbellekten gelir
+            if self.thumbnails is not None: thumbnail = self.thumbnails.load(image_path)
+            else: thumbnail = load_thumbnail(image_path)
+            self.image_label.setPixmap(QPixmap.fromImage(thumbnail) if thumbnail is not None else QPixmap());
+            self.image_label.setObjectName("ImageLabel")
+        else:
+            self.image_label.clear()
+            self.image_label.setObjectName("ImagePlaceholder");
+            self.image_label.setText(self.translator.get("placeholder_image"))
+        themes.polish(self.image_label)
+
+    def paintEvent(self, event):
+        # Kart çerçevesi paletten çizilir (QSS yok): tema değişiminde yalnızca yeniden çizim
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(self.palette().color(themes.Role.Midlight), 1))
+        painter.setBrush(self.palette().color(themes.Role.Light))
+        painter.drawRoundedRect(QRectF(self.rect()).adjusted(0.5, 0.5, -0.5, -0.5),
+                                themes.CARD_RADIUS, themes.CARD_RADIUS)
+
+    def set_image_available(self, available):
+        if available == self.image_available: return
+        self.image_available = available
+        self.render_image()
+
     def open_details_dialog(self):
-        dialog = DetailsDialog(self.translator, self.prompt_data, self)
+        from dialogs import DetailsDialog
+        dialog = DetailsDialog(self.translator, self.prompt_data, self, self.wildcard_library, self.versions)
         dialog.exec()
 
     def confirm_delete(self):
@@ -405,15 +281,23 @@ class PromptCard(QWidget):
         self.details_button.setText(self.translator.get("button_details"))
         self.edit_button.setText(self.translator.get("button_edit"))
         self.delete_button.setText(self.translator.get("button_delete"))
+        self.language = self.translator.get_current_language()
 
     def retranslate_ui(self, translator):
         self.translator = translator
         self.retranslate_card_buttons()
         self.title_label.setText(self.prompt_data.get('title', 'No Title'))
 
-        if not (self.prompt_data.get("image_path") and os.path.exists(self.prompt_data.get("image_path"))):
+        if not self.image_available:
             self.image_label.setText(self.translator.get("placeholder_image"))
 
+    def language_stale(self):
+        return self.language != self.translator.get_current_language()
+
+    def sync_language(self):
+        # Grid, kart görünür alana girdiğinde çağırır; dil değişmediyse hiçbir şey yapmaz
+        if self.language_stale(): self.retranslate_ui(self.translator)
+
     def update_card_ui(self, new_data):
         self.prompt_data = new_data
         self.build_ui()